@@ -0,0 +1,23 @@
+"""
+Latency measurement shared by the benchmarks, so their numbers compare
+"""
+
+import time
+
+import numpy as np
+
+
+def latency(fn, *args, min_seconds=1.0, max_calls=100_000):
+    """Median seconds per call of fn(*args)
+
+    One warm-up call, then at least 5 timed calls, repeated until
+    min_seconds have passed or max_calls were made.
+    """
+    fn(*args)
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while len(timings) < max_calls and (len(timings) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
@@ -0,0 +1,92 @@
+"""
+Benchmark single-pass evaluate_model against predict + predict_proba + sklearn metrics
+
+Usage (from the project root):
+    python benchmarks/bench_evaluation.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+    roc_curve,
+)
+
+sys.path.append("src")
+from evaluation import MODELS_PATH, evaluate_model
+from storage import load_feature_matrix
+
+
+def two_pass_evaluation(model, X, y):
+    """The previous evaluate_model: two model passes and one sklearn call per metric"""
+    y_pred = model.predict(X)
+    y_pred_proba = model.predict_proba(X)[:, 1]
+    fpr, tpr, _ = roc_curve(y, y_pred_proba)
+    return {
+        "accuracy": accuracy_score(y, y_pred),
+        "precision": precision_score(y, y_pred),
+        "recall": recall_score(y, y_pred),
+        "f1_score": f1_score(y, y_pred),
+        "roc_auc": roc_auc_score(y, y_pred_proba),
+        "fpr": fpr,
+        "tpr": tpr,
+    }
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--models", nargs="+", default=["logistic_regression", "random_forest", "xgboost"]
+    )
+    args = parser.parse_args()
+
+    X, y, _ = load_feature_matrix("test", as_frame=True)
+    reps = -(-args.rows // len(X))
+    X = X.iloc[np.tile(np.arange(len(X)), reps)[: args.rows]].reset_index(drop=True)
+    y = np.tile(y.to_numpy(), reps)[: args.rows]
+
+    print(f"\nEvaluating on {len(X):,} rows")
+    for name in args.models:
+        path = f"{MODELS_PATH}{name}.pkl"
+        if not os.path.exists(path):
+            print(f"   {name}: skipped, {path} not found")
+            continue
+        model = joblib.load(path)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            old_s, old = timed(lambda: two_pass_evaluation(model, X, y), args.repeat)
+            new_s, new = timed(lambda: evaluate_model(model, X, y), args.repeat)
+
+        for metric in ["accuracy", "precision", "recall", "f1_score", "roc_auc"]:
+            assert abs(old[metric] - new[metric]) < 1e-9, (name, metric, old[metric], new[metric])
+
+        print(f"   {name}:")
+        print(f"      predict + predict_proba + sklearn: {old_s:8.3f} s")
+        print(f"      single-pass evaluate_model:        {new_s:8.3f} s")
+        print(f"      Speedup:                           {old_s / new_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
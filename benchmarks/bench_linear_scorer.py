@@ -0,0 +1,71 @@
+"""
+Benchmark the fused logistic scorer against scaler.transform + DataFrame + predict_proba
+
+Both start from the same encoded rows (category codes and raw numeric
+values of data/raw/telco_dataset.csv, tiled to the batch size).
+
+Usage (from the project root):
+    python benchmarks/bench_linear_scorer.py
+"""
+
+import argparse
+import sys
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append("src")
+from pipeline import MODELS_PATH, ChurnPipeline
+from score import RAW_DATA_PATH
+
+from _timing import latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 100, 100_000])
+    args = parser.parse_args()
+
+    pipeline = ChurnPipeline.from_artifacts("logistic_regression")
+    scaler = joblib.load(f"{MODELS_PATH}scaler.pkl")
+    model, fused = pipeline.model, pipeline.fused
+
+    codes, numeric = pipeline.encode(pd.read_csv(RAW_DATA_PATH))
+    reps = -(-max(args.batch_sizes) // len(codes))
+    codes, numeric = np.tile(codes, (reps, 1)), np.tile(numeric, (reps, 1))
+
+    # The unscaled feature matrix the scaler expects, in feature_names order
+    X = np.empty((len(codes), len(pipeline.feature_names)))
+    X[:, pipeline.categorical_index] = codes
+    for k, col in enumerate(pipeline.numeric_columns):
+        X[:, pipeline.feature_names.index(col)] = numeric[:, k]
+    X = pd.DataFrame(X, columns=pipeline.feature_names)
+
+    def sklearn_path(n):
+        scaled = pd.DataFrame(scaler.transform(X.iloc[:n]), columns=pipeline.feature_names)
+        return model.predict_proba(scaled)[:, 1]
+
+    def fused_path(n):
+        return fused.predict_proba(codes[:n], numeric[:n])
+
+    error = np.abs(sklearn_path(len(X)) - fused_path(len(X))).max()
+    print(f"\nLogistic regression scoring ({codes.dtype} codes, {len(fused.table)} table entries)")
+    print(f"   Max |P(churn) difference|: {error:.1e}")
+
+    print(f"   {'Path':<40}" + "".join(f"{f'batch {n:,}':>16}" for n in args.batch_sizes))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        rows = {"scaler + DataFrame + predict_proba": sklearn_path, "FusedLogisticScorer": fused_path}
+        timings = {}
+        for label, fn in rows.items():
+            timings[label] = [latency(fn, n) for n in args.batch_sizes]
+            print(f"   {label:<40}" + "".join(f"{s * 1e3:13.3f} ms" for s in timings[label]))
+
+    speedups = [old / new for old, new in zip(*timings.values())]
+    print(f"   {'Speedup':<40}" + "".join(f"{s:15.1f}x" for s in speedups))
+
+
+if __name__ == "__main__":
+    main()
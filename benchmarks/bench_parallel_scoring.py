@@ -0,0 +1,73 @@
+"""
+Benchmark batch scoring throughput from 1 to N worker processes
+
+Usage (from the project root):
+    python benchmarks/bench_parallel_scoring.py --rows 2000000 --model xgboost
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.append("src")
+from pipeline import ChurnPipeline
+from score import RAW_DATA_PATH, score_file
+
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to max_workers (always included)"""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--model", default="xgboost")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    pipeline = ChurnPipeline.from_artifacts(args.model)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        raw = pd.read_csv(RAW_DATA_PATH)
+        raw = pd.concat([raw] * -(-args.rows // len(raw)), ignore_index=True).iloc[: args.rows]
+        input_path = os.path.join(tmpdir, "customers.parquet")
+        raw.to_parquet(input_path, index=False)
+        del raw
+
+        print(f"\nScoring {args.rows:,} rows with {args.model} on {os.cpu_count()} CPUs")
+        print(f"{'workers':>8}{'seconds':>10}{'rows/s':>14}{'speedup':>10}{'efficiency':>12}")
+
+        baseline = None
+        reference = None
+        for workers in worker_counts(args.max_workers):
+            output_path = os.path.join(tmpdir, f"scores_{workers}.parquet")
+            rows, elapsed = score_file(
+                pipeline, input_path, output_path, args.chunk_size, workers=workers, verbose=False
+            )
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(
+                f"{workers:>8}{elapsed:>10.2f}{rows / elapsed:>14,.0f}"
+                f"{speedup:>9.2f}x{speedup / workers:>11.0%}"
+            )
+
+            # Output must not depend on the number of workers
+            scores = pd.read_parquet(output_path)
+            if reference is None:
+                reference = scores
+            else:
+                pd.testing.assert_frame_equal(scores, reference)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark the prediction cache: repeated profiles against scoring with the model
+
+Single profiles go through RowScorer (as in the app's prediction page),
+batches through ChurnPipeline.predict_proba (as in the scoring service),
+each with a warm cache and without one.
+
+Usage (from the project root):
+    python benchmarks/bench_prediction_cache.py --model xgboost
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append("src")
+from pipeline import ChurnPipeline, RowScorer
+from prediction_cache import PredictionCache
+from score import RAW_DATA_PATH
+
+from _timing import latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="xgboost")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    pipeline = ChurnPipeline.from_artifacts(args.model)
+    raw = pd.read_csv(RAW_DATA_PATH, nrows=args.batch_size).drop(columns=["Churn"], errors="ignore")
+    profile = raw.iloc[0].to_dict()
+
+    print(f"\nPrediction cache ({args.model}, model version {pipeline.version})")
+
+    scorer, cached_scorer = RowScorer(pipeline), RowScorer(pipeline, cache=PredictionCache())
+    row = {"RowScorer.score": latency(lambda: scorer.score(profile))}
+    row["RowScorer.score, cache hit"] = latency(lambda: cached_scorer.score(profile))
+    assert cached_scorer.score(profile) == scorer.score(profile)
+
+    uncached = pipeline.predict_proba(raw)[:, 1]
+    batch = {f"predict_proba, {len(raw)} rows": latency(lambda: pipeline.predict_proba(raw))}
+    pipeline.cache = PredictionCache()
+    batch[f"predict_proba, {len(raw)} rows, all misses"] = latency(
+        lambda: (pipeline.cache.invalidate(), pipeline.predict_proba(raw))
+    )
+    batch[f"predict_proba, {len(raw)} rows, all hits"] = latency(lambda: pipeline.predict_proba(raw))
+    error = np.abs(pipeline.predict_proba(raw)[:, 1] - uncached).max()
+
+    for label, seconds in {**row, **batch}.items():
+        print(f"   {label:<45} {seconds * 1e6:12.1f} µs")
+    print(f"   Max |P(churn) difference| cached vs model: {error:.1e}")
+    print(f"   Cache stats: {pipeline.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
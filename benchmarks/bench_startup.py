@@ -0,0 +1,174 @@
+"""
+Benchmark Streamlit app cold start and rerun latency per page, with -X importtime
+
+Every measurement runs the app in a fresh interpreter (python -X importtime)
+through streamlit's AppTest. The cold start is the first run of a worker
+(the default page) plus selecting the page in the sidebar radio by its
+position, so apps without a page session key are measured the same way;
+the second timing is a rerun of that page. Imports triggered by the app
+script itself are attributed from the importtime report. Exceptions the
+app raises are reported per page.
+
+A baseline app runs against the current artifacts, so it must be able to
+load them:
+- apps before the Parquet storage change read data/processed/*.csv: run
+  the data pipeline with PROCESSED_DATA_FORMAT = "csv" first;
+- models/xgboost.pkl must be a standard XGBClassifier
+  (XGBOOST_CATEGORICAL = False, the default); a categorical model is a
+  boosting.BoosterClassifier that only this tree's src/ can unpickle;
+- the original app (d4b5758) calls Axes.boxplot(labels=...), which
+  matplotlib 3.11 removed, so it needs matplotlib < 3.11.
+
+Usage (from the project root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --baseline HEAD~1 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_PATH = "streamlit_app/app.py"
+PAGES = [
+    "🏠 Executive Dashboard",
+    "🔮 Churn Prediction",
+    "📊 Analytics",
+    "🤖 Model Performance",
+    "ℹ️ About Platform",
+]
+MARKER = "--- app run starts ---"
+
+
+def _exceptions(at):
+    return [exception.message.splitlines()[0] for exception in at.exception]
+
+
+def run_child(app_path, page):
+    """Cold run and rerun of one page; importtime output goes to stderr"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=600)
+    result = {"cold": None, "rerun": None, "exceptions": []}
+
+    print(MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    at.run()
+    if at.exception or not at.sidebar.radio:
+        # The app failed before its navigation was drawn
+        result["exceptions"] = _exceptions(at) or ["no navigation radio in the sidebar"]
+        print(json.dumps(result))
+        return
+    radio = at.sidebar.radio[0]
+    index = PAGES.index(page)
+    if radio.index != index:
+        radio.set_value(radio.options[index]).run()
+    result["cold"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    at.run()
+    result["rerun"] = time.perf_counter() - start
+    result["exceptions"] = _exceptions(at)
+    print(json.dumps(result))
+
+
+def parse_importtime(stderr):
+    """Top-level modules imported by the app run and their cumulative time (us)"""
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def measure(app_path, page, repeat):
+    """Median timings of one page, or None timings with the app's failures"""
+    results = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", __file__, "--child", "--app", app_path, "--page", page],
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "no output"
+            return {"cold": None, "rerun": None, "import": 0.0, "top": [], "exceptions": [error]}
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        result["imports"] = parse_importtime(process.stderr)
+        results.append(result)
+        if result["cold"] is None:
+            break
+
+    exceptions = sorted({e for r in results for e in r["exceptions"]})
+    imports = results[0]["imports"]
+    measured = [r for r in results if r["cold"] is not None]
+    return {
+        "cold": statistics.median(r["cold"] for r in measured) if measured else None,
+        "rerun": statistics.median(r["rerun"] for r in measured) if measured else None,
+        "import": sum(imports.values()) / 1e6,
+        "top": sorted(imports.items(), key=lambda item: -item[1])[:3],
+        "exceptions": exceptions,
+    }
+
+
+def report(label, app_path, repeat):
+    print(f"\n{label}: {app_path}")
+    print(f"   {'Page':<24} {'cold (s)':>9} {'rerun (s)':>10} {'app imports (s)':>16}   slowest imports")
+    summary = {}
+    for page in PAGES:
+        m = measure(app_path, page, repeat)
+        summary[page] = m
+        if m["cold"] is None:
+            print(f"   {page:<24} {'failed':>9}")
+        else:
+            slowest = ", ".join(f"{name} {us / 1e3:.0f}ms" for name, us in m["top"])
+            print(f"   {page:<24} {m['cold']:9.3f} {m['rerun']:10.3f} {m['import']:16.3f}   {slowest}")
+        for exception in m["exceptions"]:
+            print(f"      ⚠️ {exception}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--baseline", default=None, help="git revision of the app to compare against")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--page", default=PAGES[0], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.app, args.page)
+        return
+
+    current = report("Current app", args.app, args.repeat)
+
+    if args.baseline:
+        source = subprocess.run(
+            ["git", "show", f"{args.baseline}:{APP_PATH}"], capture_output=True, text=True, check=True
+        ).stdout
+        with tempfile.NamedTemporaryFile("w", suffix=".py", dir="streamlit_app", delete=False) as f:
+            f.write(source)
+        try:
+            baseline = report(f"Baseline ({args.baseline})", f.name, args.repeat)
+        finally:
+            os.remove(f.name)
+
+        print("\nCold start speedup vs baseline")
+        for page in PAGES:
+            if baseline[page]["cold"] is None or current[page]["cold"] is None:
+                print(f"   {page:<24}    n/a (app failed, see above)")
+            else:
+                print(f"   {page:<24} {baseline[page]['cold'] / current[page]['cold']:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark on-disk size and load time of processed data per storage format
+
+Usage (from the project root):
+    python benchmarks/bench_storage.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append("src")
+import storage
+from data_processor import RAW_DATA_PATH, ChurnDataProcessor, clean_frame
+
+
+def build_frames(rows):
+    """Cleaned frame and its encoded/scaled feature frame, replicated to `rows`"""
+    raw = pd.read_csv(RAW_DATA_PATH)
+    repeats = -(-rows // len(raw))
+    raw = pd.concat([raw] * repeats, ignore_index=True).iloc[:rows]
+    raw["customerID"] = raw["customerID"] + "-" + (raw.index // 7043).astype(str)
+
+    cleaned, _ = clean_frame(raw)
+
+    processor = ChurnDataProcessor()
+    processor.df = cleaned.copy()
+    X, y = processor.prepare_for_ml()
+    features = pd.DataFrame(processor.scaler.fit_transform(X), columns=X.columns)
+    features["Churn"] = y
+    return {"cleaned_data": cleaned, "train_data": features}
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = build_frames(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage.PROCESSED_DATA_PATH = tmpdir + os.sep
+
+        print(f"\n{'artifact':<14}{'format':<10}{'size MB':>10}{'write s':>10}{'load s':>10}")
+        for name, frame in frames.items():
+            baseline = None
+            for data_format in storage.FILE_EXTENSIONS:
+                write_s = best_of(1, lambda: storage.write_processed(frame, name, data_format))
+                size_mb = os.path.getsize(storage.processed_path(name, data_format)) / 1e6
+                load_s = best_of(
+                    args.repeat, lambda: storage.read_processed(name, data_format)
+                )
+                if baseline is None:
+                    baseline = (size_mb, load_s)
+                print(
+                    f"{name:<14}{data_format:<10}{size_mb:>10.1f}{write_s:>10.2f}{load_s:>10.3f}"
+                    f"   ({baseline[0] / size_mb:.1f}x smaller, {baseline[1] / load_s:.1f}x faster)"
+                )
+
+
+if __name__ == "__main__":
+    main()
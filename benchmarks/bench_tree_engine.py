@@ -0,0 +1,68 @@
+"""
+Benchmark the compiled tree engine against XGBoost's own prediction paths
+
+Latency per call at batch sizes 1, 100 and 100k rows of the test matrix,
+for the saved XGBoost model, plus the largest probability difference.
+
+Usage (from the project root):
+    python benchmarks/bench_tree_engine.py --model xgboost
+"""
+
+import argparse
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append("src")
+from evaluation import MODELS_PATH
+from storage import load_feature_matrix
+from tree_engine import CompiledTrees
+
+from _timing import latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="xgboost")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 100, 100_000])
+    args = parser.parse_args()
+
+    model = joblib.load(f"{MODELS_PATH}{args.model}.pkl")
+    start = time.perf_counter()
+    compiled = CompiledTrees.from_model(model)
+    compile_s = time.perf_counter() - start
+
+    X_test, _, feature_names = load_feature_matrix("test")
+    reps = -(-max(args.batch_sizes) // len(X_test))
+    X_all = np.tile(np.asarray(X_test), (reps, 1))
+
+    paths = {"model.predict_proba(DataFrame)": lambda X: model.predict_proba(
+        pd.DataFrame(X, columns=feature_names, copy=False)
+    )[:, 1]}
+    if hasattr(model, "get_booster"):
+        booster = model.get_booster()
+        paths["booster.inplace_predict"] = lambda X: booster.inplace_predict(X)
+    paths["CompiledTrees.predict_proba"] = lambda X: compiled.predict_proba(X)[:, 1]
+
+    print(f"\n{args.model}: {compiled.n_trees} trees, depth {compiled.depth}, compiled in {compile_s * 1e3:.0f} ms")
+    error = np.abs(compiled.predict_proba(X_all)[:, 1] - paths[next(iter(paths))](X_all)).max()
+    print(f"   Max |P(churn) difference| vs the model: {error:.1e}")
+
+    header = "".join(f"{f'batch {n:,}':>16}" for n in args.batch_sizes)
+    print(f"   {'Path':<32}{header}")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for label, fn in paths.items():
+            cells = []
+            for n in args.batch_sizes:
+                seconds = latency(fn, X_all[:n])
+                cells.append(f"{seconds * 1e3:13.3f} ms")
+            print(f"   {label:<32}" + "".join(f"{cell:>16}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark successive-halving tuning against the notebook's subsampled GridSearchCV
+
+Usage (from the project root):
+    python benchmarks/bench_tuning.py --n-jobs -1
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import GridSearchCV
+
+sys.path.append("src")
+from evaluation import classification_metrics
+from storage import load_feature_matrix
+from tuning import PARAM_GRIDS, RANDOM_SEED, build_model, tune
+
+
+def notebook_grid_search(X, y, n_jobs, sample_size=3000):
+    """03_xgboost_training: exhaustive 3-fold grid on a random subsample, then a full fit"""
+    rng = np.random.default_rng(RANDOM_SEED)
+    sample_idx = rng.choice(len(X), min(sample_size, len(X)), replace=False)
+
+    grid_search = GridSearchCV(
+        build_model("xgboost", n_jobs=1),
+        PARAM_GRIDS["xgboost"],
+        cv=3,
+        scoring="roc_auc",
+        n_jobs=n_jobs,
+    )
+    grid_search.fit(X.iloc[sample_idx], y.iloc[sample_idx])
+
+    model = build_model("xgboost", **grid_search.best_params_)
+    model.fit(X, y)
+    return model, grid_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    X_train, y_train, _ = load_feature_matrix("train", as_frame=True)
+    X_test, y_test, _ = load_feature_matrix("test", as_frame=True)
+
+    def test_auc(model):
+        return classification_metrics(np.asarray(y_test), model.predict_proba(X_test)[:, 1])["roc_auc"]
+
+    start = time.perf_counter()
+    grid_model, grid_search = notebook_grid_search(X_train, y_train, args.n_jobs)
+    grid_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    halving_model, report = tune("xgboost", X_train, y_train, n_jobs=args.n_jobs)
+    halving_s = time.perf_counter() - start
+
+    n_grid = len(grid_search.cv_results_["params"])
+    print(f"\nXGBoost tuning ({len(X_train):,} training rows)")
+    print(f"   GridSearchCV, 3-fold on 3,000 rows:        {grid_s:8.1f} s  "
+          f"({n_grid * 3} fits, test ROC-AUC {test_auc(grid_model):.4f})")
+    print(f"   Successive halving, {report['cv_folds']}-fold on all rows:  {halving_s:8.1f} s  "
+          f"({report['n_fits']} fits, test ROC-AUC {test_auc(halving_model):.4f})")
+    print(f"   Speedup: {grid_s / halving_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark native XGBoost training (QuantileDMatrix, categorical splits, external memory)
+against XGBClassifier.fit on the DataFrame view of the feature matrix
+
+The training matrix is tiled to --rows and written as a memory-mapped .npy,
+as the data processing pipeline does. Every path runs in a fresh
+interpreter, so peak RSS is measured in isolation.
+
+Usage (from the project root):
+    python benchmarks/bench_xgboost_training.py --rows 2000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append("src")
+from boosting import MODELS_CONFIG, MODELS_PATH, fit_booster
+from evaluation import classification_metrics
+from storage import load_feature_matrix
+
+PATHS = {
+    "dataframe": "XGBClassifier.fit(DataFrame)",
+    "numeric": "QuantileDMatrix, numeric codes",
+    "quantile": "QuantileDMatrix + categorical",
+    "external": "ExtMemQuantileDMatrix (disk)",
+}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(path, data_dir, n_jobs):
+    X = np.load(os.path.join(data_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"), mmap_mode="r")
+    _, _, feature_names = load_feature_matrix("train")
+    X_test, y_test, _ = load_feature_matrix("test")
+    rss_before = peak_rss_mb()
+
+    start = time.perf_counter()
+    if path == "dataframe":
+        # 03_xgboost_training / XGBClassifier defaults on the DataFrame view
+        from xgboost import XGBClassifier
+
+        model = XGBClassifier(**{**MODELS_CONFIG["xgboost"], "n_jobs": n_jobs})
+        model.fit(pd.DataFrame(X, columns=feature_names, copy=False), pd.Series(y, copy=False))
+        X_test = pd.DataFrame(X_test, columns=feature_names, copy=False)
+    else:
+        scaler = joblib.load(f"{MODELS_PATH}scaler.pkl")
+        model = fit_booster(
+            X,
+            y,
+            feature_names,
+            scaler,
+            n_jobs=n_jobs,
+            categorical=path != "numeric",
+            external_memory=path == "external",
+            cache_dir=data_dir,
+        )
+    fit_seconds = time.perf_counter() - start
+
+    auc = classification_metrics(np.asarray(y_test), model.predict_proba(X_test)[:, 1])["roc_auc"]
+    print(json.dumps({
+        "fit": fit_seconds,
+        "peak": peak_rss_mb(),
+        "growth": peak_rss_mb() - rss_before,
+        "auc": auc,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--paths", nargs="+", default=list(PATHS), choices=list(PATHS))
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--data", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    n_jobs = os.cpu_count() if args.n_jobs < 0 else args.n_jobs
+    if args.child:
+        run_child(args.child, args.data, n_jobs)
+        return
+
+    X, y, _ = load_feature_matrix("train")
+    with tempfile.TemporaryDirectory() as data_dir:
+        reps = -(-args.rows // len(X))
+        index = np.tile(np.arange(len(X)), reps)[: args.rows]
+        matrix = np.lib.format.open_memmap(
+            os.path.join(data_dir, "X.npy"), mode="w+", dtype=np.float32, shape=(args.rows, X.shape[1])
+        )
+        for start in range(0, args.rows, 1_000_000):
+            matrix[start:start + 1_000_000] = X[index[start:start + 1_000_000]]
+        matrix.flush()
+        del matrix
+        np.save(os.path.join(data_dir, "y.npy"), np.asarray(y)[index])
+        matrix_mb = args.rows * X.shape[1] * 4 / 1024 / 1024
+
+        print(f"\nXGBoost training on {args.rows:,} rows ({matrix_mb:,.0f} MB float32), {n_jobs} threads")
+        print(f"   {'Path':<32} {'fit (s)':>8} {'peak RSS (MB)':>14} {'growth (MB)':>12} {'test AUC':>9}")
+        for path in args.paths:
+            process = subprocess.run(
+                [sys.executable, __file__, "--child", path, "--data", data_dir, "--n-jobs", str(n_jobs)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            r = json.loads(process.stdout.strip().splitlines()[-1])
+            print(
+                f"   {PATHS[path]:<32} {r['fit']:8.1f} {r['peak']:14.0f} {r['growth']:12.0f} {r['auc']:9.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
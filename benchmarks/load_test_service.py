@@ -0,0 +1,186 @@
+"""
+Load test for the scoring service: many concurrent keep-alive callers on localhost
+
+Each caller holds one connection and sends --requests POST /score requests
+with a raw telco record, back to back. Reports throughput, latency
+percentiles and the server's mean batch size.
+
+Usage (from the project root):
+    python src/service.py &
+    python benchmarks/load_test_service.py --concurrency 2000
+
+    # Start the service itself, once per configuration: per-request scoring
+    # (--max-batch 1) against micro-batching
+    python benchmarks/load_test_service.py --spawn --compare
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append("src")
+from score import RAW_DATA_PATH
+from service import SERVICE_BATCH_WINDOW_MS, SERVICE_HOST, SERVICE_MAX_BATCH, SERVICE_PORT
+
+
+def request_bodies(n=1000):
+    """Encoded /score bodies, one raw customer record each"""
+    raw = pd.read_csv(RAW_DATA_PATH, nrows=n).drop(columns=["Churn"], errors="ignore")
+    return [json.dumps(record).encode() for record in raw.to_dict("records")]
+
+
+async def http_request(reader, writer, method, path, body=b""):
+    """Send one request on an open connection, return (status, body)"""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def caller(host, port, bodies, offset, n_requests, latencies, errors):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        errors.append("connect")
+        return
+    try:
+        for i in range(n_requests):
+            body = bodies[(offset + i) % len(bodies)]
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, "POST", "/score", body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+        errors.append("connection")
+    finally:
+        writer.close()
+
+
+async def health(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await http_request(reader, writer, "GET", "/health")
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, n_requests, bodies):
+    latencies, errors = [], []
+    before = await health(host, port)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(caller(host, port, bodies, i, n_requests, latencies, errors) for i in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    after = await health(host, port)
+
+    batches = after["batches"] - before["batches"]
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "latency_ms": {
+            f"p{q}": float(np.percentile(latencies, q) * 1e3) if latencies else None
+            for q in (50, 90, 99)
+        },
+        "batch_records": (after["records"] - before["records"]) / batches if batches else 0,
+    }
+
+
+def spawn_service(args, window_ms, max_batch):
+    """Start src/service.py and wait until it listens"""
+    process = subprocess.Popen(
+        [
+            sys.executable, "src/service.py", "--model", args.model, "--host", args.host,
+            "--port", str(args.port), "--window-ms", str(window_ms), "--max-batch", str(max_batch),
+            *(["--no-cache"] if args.no_cache else []),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    if "Serving" not in line:
+        process.kill()
+        raise RuntimeError(f"service did not start: {line.strip()}")
+    return process
+
+
+def report(label, result):
+    latency = result["latency_ms"]
+    print(
+        f"   {label:<40} {result['rps']:9,.0f} req/s   p50 {latency['p50']:7.1f} ms   "
+        f"p90 {latency['p90']:7.1f} ms   p99 {latency['p99']:7.1f} ms   "
+        f"{result['batch_records']:6.1f} records/batch   {result['errors']} errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--concurrency", type=int, default=1000, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=20, help="requests per connection")
+    parser.add_argument("--spawn", action="store_true", help="start the service for the test")
+    parser.add_argument("--compare", action="store_true", help="with --spawn: also run with --max-batch 1")
+    parser.add_argument("--model", default="xgboost", help="model to serve with --spawn")
+    parser.add_argument("--window-ms", type=float, default=SERVICE_BATCH_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=SERVICE_MAX_BATCH)
+    parser.add_argument("--no-cache", action="store_true", help="with --spawn: disable the prediction cache")
+    parser.add_argument("--output", default=None, help="write the results as JSON")
+    args = parser.parse_args()
+
+    bodies = request_bodies()
+    total = args.concurrency * args.requests
+    print(f"\nLoad test: {args.concurrency:,} connections x {args.requests} requests = {total:,} requests")
+
+    if not args.spawn:
+        result = asyncio.run(run_load(args.host, args.port, args.concurrency, args.requests, bodies))
+        report(f"http://{args.host}:{args.port}", result)
+        results = {"service": result}
+    else:
+        configs = {f"micro-batching ({args.window_ms:g} ms, {args.max_batch})": (args.window_ms, args.max_batch)}
+        if args.compare:
+            configs = {"per-request scoring (max batch 1)": (0, 1), **configs}
+        results = {}
+        for label, (window_ms, max_batch) in configs.items():
+            process = spawn_service(args, window_ms, max_batch)
+            try:
+                results[label] = asyncio.run(
+                    run_load(args.host, args.port, args.concurrency, args.requests, bodies)
+                )
+            finally:
+                process.terminate()
+                process.wait()
+            report(label, results[label])
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
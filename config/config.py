@@ -8,15 +8,32 @@ PROCESSED_DATA_PATH = "data/processed/"
 MODELS_PATH = "models/"
 REPORTS_PATH = "reports/"
 
+# Storage format for processed data: "csv", "parquet" or "feather" (Arrow IPC)
+PROCESSED_DATA_FORMAT = "parquet"
+
+# Downcast the cleaned dataframe to category/int8/float32 dtypes (opt-in)
+COMPACT_DTYPES = False
+
 # Model parameters
 RANDOM_SEED = 42
 TEST_SIZE = 0.2
 CV_FOLDS = 5
 
+# Streaming configuration (rows per chunk for out-of-core processing)
+CHUNK_SIZE = 100_000
+
 # Streamlit configuration
 APP_TITLE = "Customer Churn Prediction System"
 APP_ICON = "🚨"
 
+# Scoring service (src/service.py): requests arriving within the batch
+# window are scored together, up to SERVICE_MAX_BATCH records
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_MODEL = "xgboost"
+SERVICE_BATCH_WINDOW_MS = 2.0
+SERVICE_MAX_BATCH = 512
+
 # Model configurations
 MODELS_CONFIG = {
     "logistic_regression": {"random_state": RANDOM_SEED, "max_iter": 1000},
@@ -29,6 +46,61 @@ MODELS_CONFIG = {
     },
 }
 
+# Hyperparameter search spaces (src/tuning.py, successive halving over CV_FOLDS)
+PARAM_GRIDS = {
+    "logistic_regression": {"C": [0.01, 0.1, 1.0, 10.0], "class_weight": [None, "balanced"]},
+    "random_forest": {
+        "n_estimators": [100, 200],
+        "max_depth": [None, 8, 16],
+        "min_samples_leaf": [1, 5, 10],
+    },
+    "xgboost": {
+        "n_estimators": [100, 200],
+        "learning_rate": [0.05, 0.1, 0.15],
+        "max_depth": [4, 6, 8],
+        "subsample": [0.8, 0.9],
+        "colsample_bytree": [0.8, 0.9],
+    },
+}
+# Budget grown between halving rounds: trees for ensembles, rows otherwise
+TUNING_RESOURCES = {"random_forest": "n_estimators", "xgboost": "n_estimators"}
+TUNING_HALVING_FACTOR = 3
+TUNING_SCORING = "roc_auc"
+TUNING_N_JOBS = -1
+# Final XGBoost fit: boosting rounds chosen by early stopping on a validation split
+MAX_BOOSTING_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 20
+VALIDATION_SIZE = 0.1
+
+# CPU cores shared by the models trained concurrently (src/train.py), -1 for all
+TRAINING_N_JOBS = -1
+# Native XGBoost training (src/boosting.py): histogram bins per feature,
+# categorical splits on CATEGORICAL_FEATURES, and whether batches are paged
+# to disk instead of quantized in memory. Categorical splits give a slightly
+# better AUC but save xgboost.pkl as a boosting.BoosterClassifier, which only
+# loads with src/ on sys.path; off, it is a standard XGBClassifier
+XGBOOST_MAX_BIN = 256
+XGBOOST_CATEGORICAL = False
+XGBOOST_EXTERNAL_MEMORY = False
+
+# Memory budget of the lazily loaded models in one app process
+MODEL_MEMORY_BUDGET_MB = 1024
+
+# Bin widths of the dashboard aggregate cube
+TENURE_BIN_WIDTH = 3  # months
+CHARGE_BIN_WIDTH = 1.0  # dollars of MonthlyCharges
+
+# Size cap of the in-process cache of rendered dashboard figures
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Cache of churn scores in front of the models (src/prediction_cache.py)
+PREDICTION_CACHE_MAX_ENTRIES = 100_000
+PREDICTION_CACHE_TTL_SECONDS = 3600  # None keeps entries until evicted
+
+# Decision thresholds on P(churn) used to turn probabilities into predictions
+DECISION_THRESHOLD = 0.5
+DECISION_THRESHOLDS = {}  # per-model overrides, e.g. {"xgboost": 0.4}
+
 # Feature categories for analysis
 CATEGORICAL_FEATURES = [
     "gender",
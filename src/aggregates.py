@@ -0,0 +1,197 @@
+"""
+Precomputed aggregate cube behind the executive and analytics dashboards
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import (
+        CATEGORICAL_FEATURES,
+        CHARGE_BIN_WIDTH,
+        MODELS_PATH,
+        TENURE_BIN_WIDTH,
+    )
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    CATEGORICAL_FEATURES = ["Contract", "PaymentMethod", "InternetService"]
+    TENURE_BIN_WIDTH = 3
+    CHARGE_BIN_WIDTH = 1.0
+
+AGGREGATE_CUBE_FILENAME = "aggregate_cube.pkl"
+
+COUNT_COLUMNS = ["customers", "churned"]
+
+
+def _counts(keys, churned):
+    """customers/churned counts per key"""
+    table = churned.groupby(keys, observed=True, sort=True).agg(["size", "sum"])
+    table.columns = COUNT_COLUMNS
+    return table.astype(np.int64)
+
+
+def _add(left, right):
+    """Sum two count tables over the union of their keys"""
+    return left.add(right, fill_value=0).astype(np.int64).sort_index()
+
+
+def _subtract(left, right):
+    """Remove the counts of right from left, dropping keys left with no customers"""
+    table = left.sub(right, fill_value=0).astype(np.int64)
+    return table[table["customers"] > 0].sort_index()
+
+
+class AggregateCube:
+    """Customer and churn counts by dimension, sized by cardinality not rows
+
+    Holds, for every categorical feature, the number of customers and of
+    churned customers per value, plus the same counts over fixed-width
+    tenure and MonthlyCharges bins and the MonthlyCharges range per churn
+    label. Cubes built from separate chunks combine with merge(), so the
+    streaming pipeline builds one without holding the data in memory, and
+    subtract() removes customers whose records a delta replaces.
+    """
+
+    def __init__(self, dimensions, tenure_bins, charge_bins, charge_range):
+        self.dimensions = dimensions
+        self.tenure_bins = tenure_bins
+        self.charge_bins = charge_bins
+        self.charge_range = charge_range
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the cube from a cleaned customer frame (or one chunk of it)"""
+        churned = df["Churn"].astype(str).eq("Yes")
+
+        dimensions = {
+            col: _counts(df[col].astype(str), churned)
+            for col in CATEGORICAL_FEATURES
+            if col in df.columns
+        }
+        tenure_bins = _counts(
+            np.floor(df["tenure"].to_numpy(np.float64) / TENURE_BIN_WIDTH).astype(np.int64),
+            churned,
+        )
+        charges = df["MonthlyCharges"].to_numpy(np.float64)
+        charge_bins = _counts(
+            np.floor(charges / CHARGE_BIN_WIDTH).astype(np.int64), churned
+        )
+        charge_range = pd.Series(charges).groupby(churned.to_numpy()).agg(["min", "max"])
+        return cls(dimensions, tenure_bins, charge_bins, charge_range)
+
+    def merge(self, other):
+        """Combine with a cube built from other customers"""
+        dimensions = dict(self.dimensions)
+        for col, table in other.dimensions.items():
+            dimensions[col] = _add(dimensions[col], table) if col in dimensions else table
+        charge_range = (
+            pd.concat([self.charge_range, other.charge_range])
+            .groupby(level=0)
+            .agg({"min": "min", "max": "max"})
+        )
+        return AggregateCube(
+            dimensions,
+            _add(self.tenure_bins, other.tenure_bins),
+            _add(self.charge_bins, other.charge_bins),
+            charge_range,
+        )
+
+    def subtract(self, other):
+        """Remove the counts of a cube built from a subset of these customers
+
+        The MonthlyCharges range is kept: a min/max cannot be subtracted,
+        so callers set charge_range from the remaining customers.
+        """
+        return AggregateCube(
+            {col: _subtract(table, other.dimensions[col]) if col in other.dimensions else table
+             for col, table in self.dimensions.items()},
+            _subtract(self.tenure_bins, other.tenure_bins),
+            _subtract(self.charge_bins, other.charge_bins),
+            self.charge_range,
+        )
+
+    @staticmethod
+    def load(path=None):
+        """Load a cube saved with save()"""
+        return joblib.load(path or f"{MODELS_PATH}{AGGREGATE_CUBE_FILENAME}")
+
+    def save(self, path=None):
+        """Persist the cube next to the other dashboard artifacts"""
+        path = path or f"{MODELS_PATH}{AGGREGATE_CUBE_FILENAME}"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    def fingerprint(self):
+        """SHA-256 of the cube contents, identifying the data behind a chart"""
+        contents = (self.dimensions, self.tenure_bins, self.charge_bins, self.charge_range)
+        return hashlib.sha256(pickle.dumps(contents)).hexdigest()
+
+    @property
+    def total_customers(self):
+        return int(self.tenure_bins["customers"].sum())
+
+    @property
+    def churned_customers(self):
+        return int(self.tenure_bins["churned"].sum())
+
+    def churn_rates(self, dimension):
+        """Retained/churned shares per value (as crosstab normalize='index'),
+        with the customer count of each value"""
+        table = self.dimensions[dimension]
+        rates = pd.DataFrame(index=table.index)
+        rates["No"] = (table["customers"] - table["churned"]) / table["customers"]
+        rates["Yes"] = table["churned"] / table["customers"]
+        rates["customers"] = table["customers"]
+        rates.index.name = dimension
+        return rates
+
+    def tenure_histogram(self):
+        """Bin edges and retained/churned counts over tenure"""
+        table = self.tenure_bins
+        bins = np.arange(table.index.min(), table.index.max() + 1)
+        table = table.reindex(bins, fill_value=0)
+        edges = np.append(bins, bins[-1] + 1) * TENURE_BIN_WIDTH
+        return edges, table["customers"] - table["churned"], table["churned"]
+
+    def charge_box_stats(self, churned, label=None):
+        """Boxplot statistics of MonthlyCharges for one churn label (ax.bxp)
+
+        Quartiles are interpolated within CHARGE_BIN_WIDTH bins; whiskers
+        follow the 1.5 IQR rule clipped to the exact range. Outliers are
+        not kept in the cube.
+        """
+        table = self.charge_bins
+        counts = table["churned"] if churned else table["customers"] - table["churned"]
+        counts = counts[counts > 0]
+        low, high = self.charge_range.loc[churned, ["min", "max"]]
+
+        cumulative = counts.cumsum().to_numpy()
+        n = cumulative[-1]
+
+        def quantile(q):
+            i = int(np.searchsorted(cumulative, q * n))
+            before = cumulative[i - 1] if i else 0
+            value = (counts.index[i] + (q * n - before) / counts.iloc[i]) * CHARGE_BIN_WIDTH
+            return float(np.clip(value, low, high))
+
+        q1, med, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        iqr = q3 - q1
+        return {
+            "label": label,
+            "q1": q1,
+            "med": med,
+            "q3": q3,
+            "whislo": max(low, q1 - 1.5 * iqr),
+            "whishi": min(high, q3 + 1.5 * iqr),
+            "fliers": [],
+        }
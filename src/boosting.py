@@ -0,0 +1,221 @@
+"""
+Native XGBoost training on the feature matrices: QuantileDMatrix, hist and categorical splits
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import (
+        CATEGORICAL_FEATURES,
+        CHUNK_SIZE,
+        MODELS_CONFIG,
+        MODELS_PATH,
+        XGBOOST_CATEGORICAL,
+        XGBOOST_EXTERNAL_MEMORY,
+        XGBOOST_MAX_BIN,
+    )
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    CHUNK_SIZE = 100_000
+    CATEGORICAL_FEATURES = []
+    MODELS_CONFIG = {
+        "xgboost": {"random_state": 42, "n_estimators": 100, "learning_rate": 0.1, "max_depth": 6}
+    }
+    XGBOOST_MAX_BIN = 256
+    XGBOOST_CATEGORICAL = False
+    XGBOOST_EXTERNAL_MEMORY = False
+
+
+class CategoryDecoder:
+    """Recover integer category codes from scaled feature rows
+
+    The feature matrices hold label-encoded categories that went through
+    the StandardScaler; code = x * scale + mean, rounded, undoes that.
+    Numeric columns are left scaled: histogram splits only depend on their
+    order. With categorical=False nothing is decoded and every column is a
+    numeric feature, so the model takes the scaled matrix as it is.
+    """
+
+    def __init__(self, feature_names, scaler, categorical=XGBOOST_CATEGORICAL):
+        self.feature_names = list(feature_names)
+        self.index = np.array(
+            [
+                j
+                for j, col in enumerate(self.feature_names)
+                if categorical and col in CATEGORICAL_FEATURES
+            ],
+            dtype=np.intp,
+        )
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)[self.index]
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)[self.index]
+        self.feature_types = [
+            "c" if categorical and col in CATEGORICAL_FEATURES else "q"
+            for col in self.feature_names
+        ]
+
+    def decode(self, X):
+        """float32 copy of a scaled batch with codes in the categorical columns"""
+        X = np.array(X, dtype=np.float32)
+        X[:, self.index] = np.rint(X[:, self.index] * self.scale + self.mean)
+        return X
+
+
+class FeatureBatches(xgb.DataIter):
+    """Row batches of a (memory-mapped) feature matrix, decoded one at a time
+
+    XGBoost pulls the batches to build its quantized matrix, so only one
+    float batch is materialized at a time. With a cache_prefix the
+    quantized pages are written to disk (external memory) instead of kept
+    in RAM.
+    """
+
+    def __init__(self, X, y, decoder, batch_size=CHUNK_SIZE, cache_prefix=None):
+        self.X = X
+        self.y = y
+        self.decoder = decoder
+        self.batch_size = batch_size
+        self._start = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._start >= len(self.X):
+            return False
+        end = self._start + self.batch_size
+        input_data(
+            data=self.decoder.decode(self.X[self._start:end]),
+            label=np.asarray(self.y[self._start:end], dtype=np.float32),
+            feature_names=self.decoder.feature_names,
+            feature_types=self.decoder.feature_types,
+        )
+        self._start = end
+        return True
+
+    def reset(self):
+        self._start = 0
+
+
+class BoosterClassifier:
+    """A trained Booster behind the predict_proba() interface of the other models
+
+    Takes the same scaled feature matrix as every saved model, so the app,
+    the evaluation cache and the scoring pipeline use it unchanged. Only
+    categorical models are saved this way: the pickle refers to this
+    module, so loading it needs src/ on sys.path.
+    """
+
+    def __init__(self, booster, decoder):
+        self.booster = booster
+        self.decoder = decoder
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = len(decoder.feature_names)
+        self.feature_names_in_ = np.array(decoder.feature_names, dtype=object)
+
+    def set_params(self, n_jobs=None):
+        """Threads used for prediction"""
+        if n_jobs is not None:
+            self.booster.set_param({"nthread": n_jobs})
+        return self
+
+    def predict_proba(self, X):
+        churn = self.booster.inplace_predict(self.decoder.decode(np.asarray(X)))
+        return np.column_stack([1 - churn, churn])
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X)[:, 1] > threshold).astype(int)
+
+    @property
+    def feature_importances_(self):
+        """Total gain per feature, normalized to sum to 1 (as XGBClassifier)"""
+        gain = self.booster.get_score(importance_type="total_gain")
+        importances = np.array([gain.get(col, 0.0) for col in self.decoder.feature_names])
+        total = importances.sum()
+        return importances / total if total > 0 else importances
+
+
+def as_classifier(booster):
+    """A standard XGBClassifier around a trained Booster, loadable with xgboost alone"""
+    model = xgb.XGBClassifier()
+    model.load_model(bytearray(booster.save_raw("json")))
+    return model
+
+
+def booster_params(params=None, n_jobs=None):
+    """xgb.train parameters and number of rounds from an XGBClassifier-style config"""
+    params = dict(MODELS_CONFIG["xgboost"] if params is None else params)
+    num_boost_round = params.pop("n_estimators", 100)
+    if "random_state" in params:
+        params["seed"] = params.pop("random_state")
+    n_jobs = params.pop("n_jobs", n_jobs)
+    if n_jobs is not None:
+        params["nthread"] = n_jobs
+
+    params.setdefault("objective", "binary:logistic")
+    params.setdefault("eval_metric", "logloss")
+    params["tree_method"] = "hist"
+    params.setdefault("max_bin", XGBOOST_MAX_BIN)
+    return params, num_boost_round
+
+
+def fit_booster(
+    X,
+    y,
+    feature_names,
+    scaler,
+    params=None,
+    n_jobs=None,
+    batch_size=CHUNK_SIZE,
+    categorical=XGBOOST_CATEGORICAL,
+    external_memory=XGBOOST_EXTERNAL_MEMORY,
+    cache_dir=None,
+):
+    """Train XGBoost on a scaled feature matrix without a DataFrame round-trip
+
+    The matrix is streamed in batches into a QuantileDMatrix, which keeps
+    only the histogram bin indices, or into an ExtMemQuantileDMatrix paged
+    under cache_dir (a temporary directory by default) when
+    external_memory is set.
+
+    Returns a standard XGBClassifier on the scaled features. With
+    categorical, CATEGORICAL_FEATURES columns are trained as categorical
+    features on their decoded codes instead, and the model is a
+    BoosterClassifier that decodes its input (see its docstring).
+    """
+    decoder = CategoryDecoder(feature_names, scaler, categorical)
+    params, num_boost_round = booster_params(params, n_jobs)
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+        if external_memory:
+            batches = FeatureBatches(
+                X, y, decoder, batch_size, cache_prefix=os.path.join(tmp_dir, "xgboost")
+            )
+            dtrain = xgb.ExtMemQuantileDMatrix(
+                batches, max_bin=params["max_bin"], nthread=n_jobs, enable_categorical=True
+            )
+        else:
+            batches = FeatureBatches(X, y, decoder, batch_size)
+            dtrain = xgb.QuantileDMatrix(
+                batches, max_bin=params["max_bin"], nthread=n_jobs, enable_categorical=True
+            )
+        booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+        del dtrain
+
+    return BoosterClassifier(booster, decoder) if categorical else as_classifier(booster)
+
+
+def fit_booster_from_artifacts(split="train", models_path=MODELS_PATH, **kwargs):
+    """fit_booster on a split written by the data processing pipeline"""
+    import joblib
+
+    from storage import load_feature_matrix
+
+    X, y, feature_names = load_feature_matrix(split)
+    scaler = joblib.load(f"{models_path}scaler.pkl")
+    return fit_booster(X, y, feature_names, scaler, **kwargs)
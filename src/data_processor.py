@@ -10,6 +10,18 @@ import joblib
 import os
 import sys
 
+from aggregates import AggregateCube
+from encoding import CategoricalEncoder
+from instrumentation import StageProfiler
+from summary import SummaryStore
+from storage import (
+    FeatureMatrixWriter,
+    ProcessedChunkWriter,
+    compact_dtypes,
+    write_feature_matrix,
+    write_processed,
+)
+
 # Add config to path
 sys.path.append("config")
 try:
@@ -19,46 +31,134 @@ except ImportError:
     RAW_DATA_PATH = "../data/raw/telco_dataset.csv"
     PROCESSED_DATA_PATH = "../data/processed/"
     MODELS_PATH = "../models/"
+    REPORTS_PATH = "../reports/"
     RANDOM_SEED = 42
     TEST_SIZE = 0.2
+    CHUNK_SIZE = 100_000
+    PROCESSED_DATA_FORMAT = "csv"
+    COMPACT_DTYPES = False
 
 
-class ChurnDataProcessor:
-    """Main class for data processing operations"""
+def clean_frame(df):
+    """Apply the cleaning steps to a raw frame (full dataset or a single chunk)
+
+    Returns the cleaned frame and the number of TotalCharges values that
+    could not be parsed and were filled with 0.
+    """
+    # Fix TotalCharges column (convert from string to numeric)
+    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+    missing_total = df["TotalCharges"].isnull().sum()
+    if missing_total > 0:
+        df["TotalCharges"] = df["TotalCharges"].fillna(0)
+
+    # Convert SeniorCitizen to string for consistency
+    df["SeniorCitizen"] = df["SeniorCitizen"].map({0: "No", 1: "Yes"})
+
+    # Create derived features
+    df["AvgMonthlyCharges"] = df["TotalCharges"] / (df["tenure"] + 1)
+
+    # Handle division by zero
+    df["AvgMonthlyCharges"] = df["AvgMonthlyCharges"].replace([np.inf, -np.inf], 0)
 
-    def __init__(self):
+    # Create tenure groups for analysis (fixed bins, so chunks agree)
+    df["TenureGroup"] = pd.cut(
+        df["tenure"],
+        bins=[0, 12, 24, 48, 100],
+        labels=["0-1 year", "1-2 years", "2-4 years", "4+ years"],
+    )
+
+    return df, missing_total
+
+
+PIPELINE_REPORT_FILENAME = "pipeline_report.json"
+PIPELINE_HISTORY_FILENAME = "pipeline_history.jsonl"
+
+
+class ChurnDataProcessor:
+    """Main class for data processing operations
+
+    Every pipeline run times its stages with a StageProfiler (wall and CPU
+    time, peak RSS delta, rows) and writes the measurements to
+    reports/pipeline_report.json, appending them to pipeline_history.jsonl.
+    callback(record) is called after each stage. Failed runs are reported
+    too, with status "failed". verbose=False silences the progress output
+    but not errors.
+    """
+
+    def __init__(self, verbose=True, callback=None):
+        self.verbose = verbose
+        self.callback = callback
+        self.profiler = None
         self.df = None
         self.encoders = {}
+        self.encoder = None
         self.scaler = StandardScaler()
         self.feature_names = []
+        self.data_summary = {}
+        self.split_rows = {}
+        self.cube = None
+
+    def _log(self, *args, **kwargs):
+        if self.verbose:
+            print(*args, **kwargs)
+
+    def _error(self, *args, **kwargs):
+        print(*args, **kwargs)
+
+    def _start_profiling(self, pipeline):
+        self.profiler = StageProfiler(pipeline, self.callback)
+        return self.profiler
+
+    def _run_profiled(self, pipeline, run, *args):
+        """Call run(profiler, *args), saving the stage report even if it fails or raises"""
+        profiler = self._start_profiling(pipeline)
+        success = False
+        try:
+            success = bool(run(profiler, *args))
+        finally:
+            if not success:
+                profiler.status = "failed"
+            self.save_report()
+        return success
+
+    def save_report(self, reports_path=REPORTS_PATH):
+        """Write the stage measurements of the last run, and print them"""
+        path = self.profiler.save(
+            f"{reports_path}{PIPELINE_REPORT_FILENAME}",
+            history_path=f"{reports_path}{PIPELINE_HISTORY_FILENAME}",
+        )
+        self._log("\n⏱️ Stage timings:")
+        self._log(self.profiler.format())
+        self._log(f"   Report saved to {path}")
+        return path
 
     def load_data(self, filepath=RAW_DATA_PATH):
         """Load the raw dataset"""
         try:
             self.df = pd.read_csv(filepath)
-            print(f"📊 Data loaded successfully: {self.df.shape}")
+            self._log(f"📊 Data loaded successfully: {self.df.shape}")
             return self.df
         except FileNotFoundError:
-            print(f"❌ Data file not found: {filepath}")
-            print("   Please place your telco_dataset.csv in data/raw/ folder")
+            self._error(f"❌ Data file not found: {filepath}")
+            self._error("   Please place your telco_dataset.csv in data/raw/ folder")
             return None
 
     def get_data_info(self):
         """Display basic information about the dataset"""
         if self.df is None:
-            print("❌ No data loaded")
+            self._error("❌ No data loaded")
             return None
 
-        print("\n📋 Dataset Information:")
-        print(f"   Shape: {self.df.shape}")
-        print(f"   Columns: {len(self.df.columns)}")
-        print(f"   Missing values: {self.df.isnull().sum().sum()}")
+        self._log("\n📋 Dataset Information:")
+        self._log(f"   Shape: {self.df.shape}")
+        self._log(f"   Columns: {len(self.df.columns)}")
+        self._log(f"   Missing values: {self.df.isnull().sum().sum()}")
 
         # Churn distribution
         if "Churn" in self.df.columns:
             churn_counts = self.df["Churn"].value_counts()
             churn_rate = churn_counts.get("Yes", 0) / len(self.df) * 100
-            print(f"   Churn rate: {churn_rate:.1f}%")
+            self._log(f"   Churn rate: {churn_rate:.1f}%")
             return {
                 "shape": self.df.shape,
                 "columns": len(self.df.columns),
@@ -76,48 +176,38 @@ class ChurnDataProcessor:
     def clean_data(self):
         """Clean the dataset"""
         if self.df is None:
-            print("❌ No data to clean")
+            self._error("❌ No data to clean")
             return None
 
-        print("🧹 Cleaning data...")
+        self._log("🧹 Cleaning data...")
 
-        # Fix TotalCharges column (convert from string to numeric)
-        self.df["TotalCharges"] = pd.to_numeric(
-            self.df["TotalCharges"], errors="coerce"
-        )
-        missing_total = self.df["TotalCharges"].isnull().sum()
+        self.df, missing_total = clean_frame(self.df)
         if missing_total > 0:
-            print(f"   Found {missing_total} missing TotalCharges values")
-            self.df["TotalCharges"].fillna(0, inplace=True)
-
-        # Convert SeniorCitizen to string for consistency
-        self.df["SeniorCitizen"] = self.df["SeniorCitizen"].map({0: "No", 1: "Yes"})
+            self._log(f"   Found {missing_total} missing TotalCharges values")
 
-        # Create derived features
-        self.df["AvgMonthlyCharges"] = self.df["TotalCharges"] / (self.df["tenure"] + 1)
+        self._log("   ✅ Data cleaning completed")
+        return self.df
 
-        # Handle division by zero
-        self.df["AvgMonthlyCharges"] = self.df["AvgMonthlyCharges"].replace(
-            [np.inf, -np.inf], 0
-        )
+    def compact_data(self):
+        """Downcast the cleaned dataset to compact dtypes"""
+        if self.df is None:
+            self._error("❌ No data to compact")
+            return None
 
-        # Create tenure groups for analysis
-        self.df["TenureGroup"] = pd.cut(
-            self.df["tenure"],
-            bins=[0, 12, 24, 48, 100],
-            labels=["0-1 year", "1-2 years", "2-4 years", "4+ years"],
+        self.df, report = compact_dtypes(self.df)
+        self._log(
+            f"🗜️ Compacted dtypes: {report['before_bytes'] / 1e6:.1f} MB → "
+            f"{report['after_bytes'] / 1e6:.1f} MB ({report['reduction']:.0%} smaller)"
         )
-
-        print("   ✅ Data cleaning completed")
-        return self.df
+        return report
 
     def prepare_for_ml(self):
         """Prepare data for machine learning"""
         if self.df is None:
-            print("❌ No data to prepare")
+            self._error("❌ No data to prepare")
             return None, None
 
-        print("🔧 Preparing data for ML...")
+        self._log("🔧 Preparing data for ML...")
 
         # Remove non-ML columns
         ml_df = self.df.drop(["customerID", "TenureGroup"], axis=1, errors="ignore")
@@ -129,21 +219,21 @@ class ChurnDataProcessor:
         # Store feature names
         self.feature_names = list(X.columns)
 
-        # Encode categorical variables
-        categorical_cols = X.select_dtypes(include=["object"]).columns
-        print(f"   Encoding {len(categorical_cols)} categorical features...")
+        # Encode all categorical variables against frozen vocabularies
+        self.encoder = CategoricalEncoder().fit(X)
+        self._log(f"   Encoding {len(self.encoder.columns)} categorical features...")
 
-        for col in categorical_cols:
-            le = LabelEncoder()
-            X[col] = le.fit_transform(X[col].astype(str))
-            self.encoders[col] = le
+        codes = self.encoder.transform(X)
+        for j, col in enumerate(self.encoder.columns):
+            X[col] = codes[:, j]
+        self.encoders.update(self.encoder.to_label_encoders())
 
         # Encode target
         target_encoder = LabelEncoder()
         y_encoded = target_encoder.fit_transform(y)
         self.encoders["target"] = target_encoder
 
-        print(f"   ✅ Data prepared for ML: {X.shape}")
+        self._log(f"   ✅ Data prepared for ML: {X.shape}")
         return X, y_encoded
 
     def split_and_scale(self, X, y):
@@ -162,7 +252,7 @@ class ChurnDataProcessor:
         X_train_scaled = pd.DataFrame(X_train_scaled, columns=self.feature_names)
         X_test_scaled = pd.DataFrame(X_test_scaled, columns=self.feature_names)
 
-        print(
+        self._log(
             f"   ✅ Data split and scaled: Train {X_train_scaled.shape}, Test {X_test_scaled.shape}"
         )
         return X_train_scaled, X_test_scaled, y_train, y_test
@@ -177,73 +267,385 @@ class ChurnDataProcessor:
         # Save training and test data
         train_data = X_train.copy()
         train_data["Churn"] = y_train
-        train_data.to_csv(f"{PROCESSED_DATA_PATH}train_data.csv", index=False)
+        write_processed(train_data, "train_data")
 
         test_data = X_test.copy()
         test_data["Churn"] = y_test
-        test_data.to_csv(f"{PROCESSED_DATA_PATH}test_data.csv", index=False)
+        write_processed(test_data, "test_data")
+
+        # Save float32 feature matrices for memory-mapped loading
+        write_feature_matrix(X_train, y_train, "train")
+        write_feature_matrix(X_test, y_test, "test")
 
         # Save cleaned original data
-        self.df.to_csv(f"{PROCESSED_DATA_PATH}cleaned_data.csv", index=False)
+        write_processed(self.df, "cleaned_data")
 
         # Save encoders and scaler
         joblib.dump(self.encoders, f"{MODELS_PATH}encoders.pkl")
         joblib.dump(self.scaler, f"{MODELS_PATH}scaler.pkl")
         joblib.dump(self.feature_names, f"{MODELS_PATH}feature_names.pkl")
 
-        # Create data summary for dashboard
-        data_summary = {
-            "total_customers": len(self.df),
-            "churned_customers": len(self.df[self.df["Churn"] == "Yes"]),
-            "churn_rate": self.df["Churn"].value_counts(normalize=True).get("Yes", 0),
-            "avg_monthly_charges": self.df["MonthlyCharges"].mean(),
-            "avg_tenure": self.df["tenure"].mean(),
-            "contract_types": self.df["Contract"].unique().tolist(),
-            "payment_methods": self.df["PaymentMethod"].unique().tolist(),
-            "internet_services": self.df["InternetService"].unique().tolist(),
-        }
-        joblib.dump(data_summary, f"{MODELS_PATH}data_summary.pkl")
+        # Create data summary for dashboard, from state that later deltas update
+        with SummaryStore() as store:
+            store.reset()
+            store.apply(self.df)
+            self.data_summary = store.summary()
+        joblib.dump(self.data_summary, f"{MODELS_PATH}data_summary.pkl")
+
+        # Aggregates behind the dashboards, so they never scan the customer rows
+        self.cube = AggregateCube.from_frame(self.df)
+        self.cube.save()
 
-        print("💾 All processed data saved successfully!")
+        self._log("💾 All processed data saved successfully!")
 
     def process_complete_pipeline(self):
         """Run the complete data processing pipeline"""
 
-        print("🔄 Starting complete data processing pipeline...")
+        self._log("🔄 Starting complete data processing pipeline...")
+        if not self._run_profiled("complete", self._complete_stages):
+            return False
+        self._log("\n🎉 Data processing pipeline completed successfully!")
+        return True
 
+    def _complete_stages(self, profiler):
         # Load data
-        if self.load_data() is None:
-            return False
+        with profiler.stage("load_data") as stage:
+            if self.load_data() is None:
+                stage["status"] = "failed"
+                return False
+            stage["rows"] = len(self.df)
 
         # Get info
-        info = self.get_data_info()
-        if info is None:
-            return False
+        with profiler.stage("get_data_info") as stage:
+            if self.get_data_info() is None:
+                stage["status"] = "failed"
+                return False
+            stage["rows"] = len(self.df)
 
         # Clean data
-        if self.clean_data() is None:
-            return False
+        with profiler.stage("clean_data") as stage:
+            if self.clean_data() is None:
+                stage["status"] = "failed"
+                return False
+            stage["rows"] = len(self.df)
 
         # Prepare for ML
-        X, y = self.prepare_for_ml()
-        if X is None:
-            return False
+        with profiler.stage("prepare_for_ml") as stage:
+            X, y = self.prepare_for_ml()
+            if X is None:
+                stage["status"] = "failed"
+                return False
+            stage["rows"] = len(X)
+
+        # Features are extracted, so the cleaned frame can be compacted
+        if COMPACT_DTYPES:
+            with profiler.stage("compact_data") as stage:
+                self.compact_data()
+                stage["rows"] = len(self.df)
 
         # Split and scale
-        X_train, X_test, y_train, y_test = self.split_and_scale(X, y)
+        with profiler.stage("split_and_scale") as stage:
+            X_train, X_test, y_train, y_test = self.split_and_scale(X, y)
+            stage["rows"] = len(X_train) + len(X_test)
 
         # Save everything
-        self.save_processed_data(X_train, X_test, y_train, y_test)
+        with profiler.stage("save_processed_data") as stage:
+            self.save_processed_data(X_train, X_test, y_train, y_test)
+            stage["rows"] = len(X_train) + len(X_test)
+        return True
 
-        print("\n🎉 Data processing pipeline completed successfully!")
+    def _split_mask(self, chunk_index, n_rows):
+        """Deterministic per-chunk test mask, identical on every pass"""
+        rng = np.random.default_rng([RANDOM_SEED, chunk_index])
+        return rng.random(n_rows) < TEST_SIZE
+
+    def fit_streaming(self, filepath=RAW_DATA_PATH, chunk_size=CHUNK_SIZE):
+        """First streaming pass: clean, then fit encoders and scaler
+
+        Cleaned chunks are appended to cleaned_data. Only category
+        counts, running numeric moments and summary totals are kept, so
+        memory is bounded by vocabulary size and feature count, not rows.
+        """
+
+        self._log("🔧 Pass 1: cleaning and fitting encoders/scaler...")
+
+        categorical_cols = None
+        numeric_cols = None
+        category_counts = {}
+        target_values = set()
+        numeric_scaler = StandardScaler()
+        totals = {"rows": 0, "train": 0, "missing": 0}
+        self.cube = None
+
+        with SummaryStore() as store, ProcessedChunkWriter("cleaned_data") as output:
+            store.reset()
+            for i, chunk in enumerate(pd.read_csv(filepath, chunksize=chunk_size)):
+                chunk, missing_total = clean_frame(chunk)
+                output.write(chunk)
+
+                X = chunk.drop(["customerID", "TenureGroup", "Churn"], axis=1, errors="ignore")
+                if categorical_cols is None:
+                    self.feature_names = list(X.columns)
+                    categorical_cols = list(X.select_dtypes(exclude="number").columns)
+                    numeric_cols = [c for c in self.feature_names if c not in categorical_cols]
+                    category_counts = {col: {} for col in categorical_cols}
+
+                # Vocabularies use every row, scaling statistics only training rows
+                train_mask = ~self._split_mask(i, len(chunk))
+                for col in categorical_cols:
+                    # str() per value, so missing values count as "nan" as in fit()
+                    values = X[col].map(str)
+                    counts = category_counts[col]
+                    for value in values.unique():
+                        counts.setdefault(value, 0)
+                    for value, count in values[train_mask].value_counts().items():
+                        counts[value] += count
+                if train_mask.any():
+                    numeric_scaler.partial_fit(X.loc[train_mask, numeric_cols])
+                    totals["train"] += int(train_mask.sum())
+                target_values.update(chunk["Churn"].unique())
+
+                # Running state for the dashboard summary and aggregates
+                totals["rows"] += len(chunk)
+                totals["missing"] += missing_total
+                store.apply(chunk)
+
+                chunk_cube = AggregateCube.from_frame(chunk)
+                self.cube = chunk_cube if self.cube is None else self.cube.merge(chunk_cube)
+
+                self._log(f"   Chunk {i + 1}: {totals['rows']:,} rows cleaned")
+
+            self.data_summary = store.summary()
+
+        if totals["missing"] > 0:
+            self._log(f"   Found {totals['missing']} missing TotalCharges values")
+
+        # Counted here: n_samples_seen_ is per feature when a numeric column has
+        # NaNs, and unset when no chunk had training rows
+        n_train = totals["train"]
+        if n_train == 0:
+            self._error(
+                f"❌ No training rows: all {totals['rows']:,} rows fell in the test split "
+                f"(TEST_SIZE={TEST_SIZE})"
+            )
+            return False
+
+        # Build LabelEncoders from the sorted vocabularies (same classes_ as fit)
+        self.encoders = {}
+        mean = np.zeros(len(self.feature_names))
+        var = np.zeros(len(self.feature_names))
+        for col in categorical_cols:
+            le = LabelEncoder()
+            le.classes_ = np.array(sorted(category_counts[col]), dtype=object)
+            self.encoders[col] = le
+
+            # Mean/variance of the integer codes follow from the category counts
+            counts = np.array([category_counts[col][c] for c in le.classes_], dtype=float)
+            codes = np.arange(len(counts), dtype=float)
+            j = self.feature_names.index(col)
+            mean[j] = (counts * codes).sum() / n_train
+            var[j] = (counts * (codes - mean[j]) ** 2).sum() / n_train
+
+        target_encoder = LabelEncoder()
+        target_encoder.classes_ = np.array(sorted(target_values), dtype=object)
+        self.encoders["target"] = target_encoder
+
+        for k, col in enumerate(numeric_cols):
+            j = self.feature_names.index(col)
+            mean[j] = numeric_scaler.mean_[k]
+            var[j] = numeric_scaler.var_[k]
+
+        # Assemble a StandardScaler equivalent to fit() on the training rows
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = mean
+        self.scaler.var_ = var
+        self.scaler.scale_ = np.where(var == 0, 1.0, np.sqrt(var))
+        self.scaler.n_samples_seen_ = n_train
+        self.scaler.n_features_in_ = len(self.feature_names)
+        self.scaler.feature_names_in_ = np.array(self.feature_names, dtype=object)
+
+        self.split_rows = {
+            "train": n_train,
+            "test": totals["rows"] - n_train,
+        }
+
+        self._log(f"   ✅ Encoders and scaler fitted on {n_train:,} training rows")
+        return True
+
+    def transform_streaming(self, filepath=RAW_DATA_PATH, chunk_size=CHUNK_SIZE):
+        """Second streaming pass: encode, scale and write train/test splits"""
+
+        self._log("🔧 Pass 2: encoding, scaling and writing splits...")
+
+        encoder = CategoricalEncoder.from_label_encoders(self.encoders)
+        outputs = {
+            "train": ProcessedChunkWriter("train_data"),
+            "test": ProcessedChunkWriter("test_data"),
+        }
+        matrices = {
+            split: FeatureMatrixWriter(split, n_rows, self.feature_names)
+            for split, n_rows in self.split_rows.items()
+        }
+
+        try:
+            for i, chunk in enumerate(pd.read_csv(filepath, chunksize=chunk_size)):
+                chunk, _ = clean_frame(chunk)
+
+                X = chunk[self.feature_names].copy()
+                codes = encoder.transform(X)
+                for j, col in enumerate(encoder.columns):
+                    X[col] = codes[:, j]
+
+                scaled = pd.DataFrame(
+                    self.scaler.transform(X), columns=self.feature_names
+                )
+                scaled["Churn"] = self.encoders["target"].transform(chunk["Churn"])
+
+                test_mask = self._split_mask(i, len(chunk))
+                for split, mask in (("train", ~test_mask), ("test", test_mask)):
+                    part = scaled[mask]
+                    outputs[split].write(part)
+                    matrices[split].write(part[self.feature_names], part["Churn"])
+        finally:
+            for writer in [*outputs.values(), *matrices.values()]:
+                writer.close()
+
+        self._log(
+            f"   ✅ Data split and scaled: Train {outputs['train'].rows_written:,} rows, "
+            f"Test {outputs['test'].rows_written:,} rows"
+        )
+        return True
+
+    def process_streaming_pipeline(self, filepath=RAW_DATA_PATH, chunk_size=CHUNK_SIZE):
+        """Run the pipeline in two streaming passes for files larger than memory
+
+        Only one chunk is held in memory at a time. The train/test split is
+        a seeded per-row draw rather than a stratified split.
+        """
+
+        self._log(f"🔄 Starting streaming pipeline ({chunk_size:,} rows per chunk)...")
+        if not self._run_profiled("streaming", self._streaming_stages, filepath, chunk_size):
+            return False
+        self._log("\n🎉 Streaming pipeline completed successfully!")
+        return True
+
+    def _streaming_stages(self, profiler, filepath, chunk_size):
+        if not os.path.exists(filepath):
+            self._error(f"❌ Data file not found: {filepath}")
+            return False
+
+        os.makedirs(PROCESSED_DATA_PATH, exist_ok=True)
+        os.makedirs(MODELS_PATH, exist_ok=True)
+
+        with profiler.stage("fit_streaming") as stage:
+            if not self.fit_streaming(filepath, chunk_size):
+                stage["status"] = "failed"
+                return False
+            stage["rows"] = sum(self.split_rows.values())
+        with profiler.stage("transform_streaming") as stage:
+            self.transform_streaming(filepath, chunk_size)
+            stage["rows"] = sum(self.split_rows.values())
+
+        # Same artifacts as save_processed_data, so the dashboard loads them as-is
+        with profiler.stage("save_processed_data"):
+            joblib.dump(self.encoders, f"{MODELS_PATH}encoders.pkl")
+            joblib.dump(self.scaler, f"{MODELS_PATH}scaler.pkl")
+            joblib.dump(self.feature_names, f"{MODELS_PATH}feature_names.pkl")
+            joblib.dump(self.data_summary, f"{MODELS_PATH}data_summary.pkl")
+            self.cube.save()
+        self._log("💾 All processed data saved successfully!")
+        return True
+
+    def update_summary(self, delta_path, chunk_size=CHUNK_SIZE):
+        """Merge a delta file of new and updated customers into data_summary
+
+        Records are matched on customerID against the state saved by the
+        last full run, so only the delta is read and re-applying the same
+        delta changes nothing. The aggregate cube gets the same update: the
+        counts of new records are added and those of the records they
+        replace subtracted. The processed splits are refreshed by the next
+        full run.
+        """
+
+        self._log(f"🔄 Applying customer delta {delta_path}...")
+        return self._run_profiled("delta", self._delta_stages, delta_path, chunk_size)
+
+    def _delta_stages(self, profiler, delta_path, chunk_size):
+        if not os.path.exists(delta_path):
+            self._error(f"❌ Delta file not found: {delta_path}")
+            return False
+
+        try:
+            cube = AggregateCube.load()
+        except FileNotFoundError:
+            self._error("❌ No aggregate cube found: run the full pipeline before applying deltas")
+            return False
+
+        inserted = updated = 0
+        with profiler.stage("update_summary") as stage:
+            with SummaryStore() as store:
+                if store.stale:
+                    self._error("❌ Summary state is from an older version: rerun the full pipeline")
+                    stage["status"] = "failed"
+                    return False
+                for chunk in pd.read_csv(delta_path, chunksize=chunk_size):
+                    chunk, _ = clean_frame(chunk)
+                    # Within one delta the last record of a customer wins
+                    chunk = chunk.drop_duplicates("customerID", keep="last")
+                    replaced = store.replaced(chunk)
+                    chunk_inserted, chunk_updated = store.apply(chunk)
+                    inserted += chunk_inserted
+                    updated += chunk_updated
+
+                    cube = cube.merge(AggregateCube.from_frame(chunk))
+                    if len(replaced):
+                        cube = cube.subtract(AggregateCube.from_frame(replaced))
+                self.data_summary = store.summary()
+                cube.charge_range = store.charge_range()
+
+            joblib.dump(self.data_summary, f"{MODELS_PATH}data_summary.pkl")
+            self.cube = cube
+            self.cube.save()
+            stage["rows"] = int(inserted + updated)
+        self._log(f"   ✅ {inserted:,} new and {updated:,} updated customers merged")
+        self._log(
+            f"💾 Summary saved: {self.data_summary['total_customers']:,} customers, "
+            f"{self.data_summary['churn_rate']:.1%} churn rate"
+        )
         return True
 
 
 if __name__ == "__main__":
-    processor = ChurnDataProcessor()
-    success = processor.process_complete_pipeline()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Churn data processing pipeline")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="process the raw file in chunks instead of loading it whole",
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--delta",
+        default=None,
+        help="raw file of new/updated customers to merge into the saved summary",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="no progress output (errors are still printed); stage timings are still written to reports/",
+    )
+    args = parser.parse_args()
+
+    processor = ChurnDataProcessor(verbose=not args.quiet)
+    if args.delta:
+        success = processor.update_summary(args.delta, chunk_size=args.chunk_size)
+    elif args.stream:
+        success = processor.process_streaming_pipeline(chunk_size=args.chunk_size)
+    else:
+        success = processor.process_complete_pipeline()
 
-    if success:
+    if success and not args.quiet:
         print("\n✅ Ready for model training and Streamlit app!")
-    else:
+    elif not success:
         print("\n❌ Pipeline failed. Please check your data file.")
@@ -0,0 +1,114 @@
+"""
+Vectorized categorical encoding with frozen vocabularies
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import CATEGORICAL_FEATURES
+except ImportError:
+    # Fallback: encode every non-numeric column
+    CATEGORICAL_FEATURES = None
+
+
+class CategoricalEncoder:
+    """Encode categorical columns as integer codes against frozen vocabularies
+
+    Codes match LabelEncoder (the position in the sorted vocabulary), but are
+    computed by hashing each column once and looking up only its distinct
+    values, instead of converting and sorting every row.
+    Values outside the vocabulary map to an explicit unknown bucket, code
+    len(vocabulary), instead of raising. Missing values are the category
+    "nan" (str(NaN)), both when fitting and when encoding.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else None
+        self.vocabularies = {}
+
+    def fit(self, df):
+        """Build the sorted vocabulary of every categorical column"""
+        if self.columns is None:
+            if CATEGORICAL_FEATURES is not None:
+                self.columns = [c for c in CATEGORICAL_FEATURES if c in df.columns]
+            else:
+                self.columns = list(df.select_dtypes(exclude="number").columns)
+
+        for col in self.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = list(series.cat.remove_unused_categories().cat.categories)
+                if series.isna().any():
+                    values.append(np.nan)
+            else:
+                values = pd.unique(series)
+            # Same string representation LabelEncoder was fitted on
+            self.vocabularies[col] = pd.Index(
+                sorted({str(value) for value in values}), dtype=object
+            )
+        return self
+
+    @classmethod
+    def from_label_encoders(cls, encoders):
+        """Build an encoder from the fitted LabelEncoders in encoders.pkl"""
+        encoder = cls(columns=[col for col in encoders if col != "target"])
+        for col in encoder.columns:
+            encoder.vocabularies[col] = pd.Index(encoders[col].classes_, dtype=object)
+        return encoder
+
+    def to_label_encoders(self):
+        """Equivalent LabelEncoders, in the format saved as encoders.pkl"""
+        encoders = {}
+        for col, vocabulary in self.vocabularies.items():
+            le = LabelEncoder()
+            le.classes_ = np.asarray(vocabulary, dtype=object)
+            encoders[col] = le
+        return encoders
+
+    def unknown_code(self, col):
+        """Code assigned to values not seen during fit"""
+        return len(self.vocabularies[col])
+
+    @property
+    def code_dtype(self):
+        """Smallest integer dtype that holds every code plus the unknown bucket"""
+        largest = max((len(v) for v in self.vocabularies.values()), default=0)
+        return np.min_scalar_type(-largest - 1)
+
+    def encode_column(self, series, col):
+        """Integer codes of one column"""
+        vocabulary = self.vocabularies[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            row_codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            # One hash pass over the rows; sorting only touches the uniques.
+            # Missing values get a code of their own, like any other value
+            row_codes, uniques = pd.factorize(series, use_na_sentinel=False)
+
+        # Look up each distinct value once, then gather per row. str() per
+        # value: Index.astype(str) keeps NaN as NaN with pandas' str dtype
+        lookup = vocabulary.get_indexer(pd.Index([str(value) for value in uniques], dtype=object))
+        missing = vocabulary.get_indexer(["nan"])[0]
+        codes = np.where(row_codes < 0, missing, lookup[row_codes])
+
+        codes = codes.astype(self.code_dtype)
+        codes[codes < 0] = self.unknown_code(col)
+        return codes
+
+    def transform(self, df):
+        """Codes of every categorical column as an (n_rows, n_columns) array"""
+        out = np.empty((len(df), len(self.columns)), dtype=self.code_dtype)
+        for j, col in enumerate(self.columns):
+            out[:, j] = self.encode_column(df[col], col)
+        return out
+
+    def fit_transform(self, df):
+        """Fit the vocabularies and return the codes"""
+        return self.fit(df).transform(df)
@@ -0,0 +1,186 @@
+"""
+Model evaluation with a persisted cache keyed on model and test-set fingerprints
+"""
+
+import hashlib
+import os
+import sys
+import threading
+
+import joblib
+import numpy as np
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import DECISION_THRESHOLD, DECISION_THRESHOLDS, MODELS_PATH
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    DECISION_THRESHOLD = 0.5
+    DECISION_THRESHOLDS = {}
+
+EVALUATION_CACHE_FILENAME = "evaluation_cache.pkl"
+
+# (path, size, mtime) -> sha256, so unchanged files are hashed once per process
+_fingerprints = {}
+
+
+def fingerprint_files(paths):
+    """SHA-256 over the contents of the given files, in order"""
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in _fingerprints:
+            file_digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    file_digest.update(block)
+            _fingerprints[key] = file_digest.hexdigest()
+        digest.update(_fingerprints[key].encode())
+    return digest.hexdigest()
+
+
+def model_threshold(name):
+    """Decision threshold configured for a model"""
+    return DECISION_THRESHOLDS.get(name, DECISION_THRESHOLD)
+
+
+def roc_points(y_true, y_score):
+    """ROC curve points and area from a single descending sort of the scores
+
+    Tied scores form one step of the curve, so the trapezoidal area equals
+    the tie-corrected Mann-Whitney AUC (roc_auc_score).
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_score = np.asarray(y_score, dtype=np.float64)
+
+    order = np.argsort(-y_score, kind="mergesort")
+    sorted_score = y_score[order]
+    sorted_true = y_true[order]
+
+    # Last index of each group of tied scores
+    group_ends = np.r_[np.flatnonzero(np.diff(sorted_score)), len(sorted_score) - 1]
+    tps = np.cumsum(sorted_true)[group_ends]
+    fps = (group_ends + 1) - tps
+
+    n_pos, n_neg = tps[-1], fps[-1]
+    if n_pos == 0 or n_neg == 0:
+        return np.array([0.0, 1.0]), np.array([0.0, 1.0]), float("nan")
+
+    fpr = np.r_[0.0, fps / n_neg]
+    tpr = np.r_[0.0, tps / n_pos]
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+    return fpr, tpr, auc
+
+
+def classification_metrics(y_true, y_score, threshold=DECISION_THRESHOLD):
+    """Accuracy, precision, recall, F1 and ROC-AUC from probabilities
+
+    Hard predictions are y_score > threshold. The four threshold metrics
+    come from one pass of confusion counts, ROC-AUC from one sort.
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_pred = np.asarray(y_score) > threshold
+
+    tp = np.count_nonzero(y_pred & y_true)
+    fp = np.count_nonzero(y_pred) - tp
+    fn = np.count_nonzero(y_true) - tp
+    tn = len(y_true) - tp - fp - fn
+
+    fpr, tpr, auc = roc_points(y_true, y_score)
+    return {
+        "accuracy": (tp + tn) / len(y_true),
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "f1_score": 2 * tp / (2 * tp + fp + fn) if tp else 0.0,
+        "roc_auc": auc,
+        "threshold": threshold,
+        "predictions": y_pred.astype(np.int8),
+        "fpr": fpr,
+        "tpr": tpr,
+    }
+
+
+def evaluate_model(model, X_test, y_test, threshold=DECISION_THRESHOLD):
+    """Performance metrics, predictions and ROC curve points of one model
+
+    The model is scored once with predict_proba; predictions are derived by
+    thresholding instead of a second predict() pass over the trees.
+    """
+    y_pred_proba = model.predict_proba(X_test)[:, 1]
+    results = classification_metrics(y_test, y_pred_proba, threshold)
+    results["probabilities"] = y_pred_proba
+    return results
+
+
+class EvaluationCache:
+    """Evaluation results persisted per model, reused while nothing changed
+
+    Each entry records the fingerprint of the model file and of the test set
+    it was computed on; a changed model or test set is re-evaluated
+    automatically, everything else is served from the cache.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or f"{MODELS_PATH}{EVALUATION_CACHE_FILENAME}"
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            try:
+                self.entries = joblib.load(self.path)
+            except Exception:
+                # Unreadable cache: start over, it is rebuilt on the next miss
+                self.entries = {}
+
+    def lookup(self, name, model_hash, test_hash, threshold=DECISION_THRESHOLD):
+        """Cached results for a model, or None if missing or stale"""
+        entry = self.entries.get(name)
+        if (
+            entry
+            and entry["model_hash"] == model_hash
+            and entry["test_hash"] == test_hash
+            and entry.get("threshold") == threshold
+        ):
+            return entry["results"]
+        return None
+
+    def results(self, models, model_hashes, test_hash, evaluate):
+        """Results for every model, calling evaluate(missing_models) on misses
+
+        evaluate receives the dict of models whose results are missing or
+        stale (including a changed decision threshold) and returns their
+        results keyed by model name.
+        """
+        with self._lock:
+            results = {}
+            missing = {}
+            for name, model in models.items():
+                cached = self.lookup(name, model_hashes[name], test_hash, model_threshold(name))
+                if cached is None:
+                    missing[name] = model
+                else:
+                    results[name] = cached
+
+            if missing:
+                fresh = evaluate(missing)
+                for name, metrics in fresh.items():
+                    self.entries[name] = {
+                        "model_hash": model_hashes[name],
+                        "test_hash": test_hash,
+                        "threshold": metrics["threshold"],
+                        "results": metrics,
+                    }
+                results.update(fresh)
+                self.save()
+
+            # Keep the caller's model order
+            return {name: results[name] for name in models if name in results}
+
+    def save(self):
+        """Write the cache atomically next to the models"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        joblib.dump(self.entries, tmp_path)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,144 @@
+"""
+Pipeline stage instrumentation: wall time, CPU time, peak memory and rows per stage
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+def _proc_status_bytes(field):
+    """A memory field (VmRSS, VmHWM) of /proc/self/status in bytes, or None"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def rss_bytes():
+    """Resident set size of this process, 0 if it cannot be measured"""
+    rss = _proc_status_bytes("VmRSS")
+    if rss is not None:
+        return rss
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return 0
+
+
+def peak_rss_bytes():
+    """Peak resident set size since start-up or the last reset_peak_rss()"""
+    peak = _proc_status_bytes("VmHWM")
+    if peak is not None:
+        return peak
+    try:
+        import resource
+
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except ImportError:
+        return 0
+
+
+def reset_peak_rss():
+    """Reset the peak RSS to the current RSS (Linux); False where unsupported"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class StageProfiler:
+    """Measurements of the stages of one pipeline run
+
+    stage(name) is a context manager yielding the stage's record, in
+    which the caller can set "rows". On exit the record gets the stage's
+    wall and CPU seconds, its RSS change and peak RSS delta (the peak
+    during the stage above the RSS it started with), is appended to
+    stages and passed to callback(record).
+
+    On Linux the peak is reset at the start of every stage, so each
+    stage's peak is its own. Elsewhere only growth of the process-wide
+    peak is visible, which under-reports stages that stay below an
+    earlier peak; report()["peak_rss_per_stage"] says which applies.
+    The caller sets status to "failed" when the run did not complete.
+    """
+
+    def __init__(self, pipeline, callback=None):
+        self.pipeline = pipeline
+        self.callback = callback
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.peak_rss_per_stage = True
+        self.status = "ok"
+
+    @contextmanager
+    def stage(self, name):
+        record = {"stage": name, "rows": None, "status": "ok"}
+        exact = reset_peak_rss()
+        self.peak_rss_per_stage &= exact
+        rss_before = rss_bytes()
+        peak_before = peak_rss_bytes()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall
+            record["cpu_seconds"] = time.process_time() - cpu
+            rss_after = rss_bytes()
+            peak = peak_rss_bytes() - (rss_before if exact else peak_before)
+            record["rss_delta_mb"] = (rss_after - rss_before) / 1024 / 1024
+            record["peak_rss_delta_mb"] = max(peak, 0) / 1024 / 1024
+            self.stages.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def report(self):
+        """JSON-serializable report of the run"""
+        return {
+            "pipeline": self.pipeline,
+            "started_at": self.started_at,
+            "status": self.status,
+            "wall_seconds": sum(stage["wall_seconds"] for stage in self.stages),
+            "cpu_seconds": sum(stage["cpu_seconds"] for stage in self.stages),
+            "peak_rss_delta_mb": max((stage["peak_rss_delta_mb"] for stage in self.stages), default=0.0),
+            "peak_rss_per_stage": self.peak_rss_per_stage,
+            "stages": self.stages,
+        }
+
+    def save(self, path, history_path=None):
+        """Write the report as JSON, and append it as one line to history_path"""
+        report = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        if history_path:
+            with open(history_path, "a") as f:
+                f.write(json.dumps(report) + "\n")
+        return path
+
+    def format(self):
+        """Human-readable table of the stages"""
+        lines = [f"   {'Stage':<22}{'Wall':>10}{'CPU':>10}{'Peak RSS':>12}{'Rows':>14}"]
+        for stage in self.stages:
+            rows = f"{stage['rows']:,}" if stage["rows"] is not None else "-"
+            lines.append(
+                f"   {stage['stage']:<22}{stage['wall_seconds']:9.2f}s{stage['cpu_seconds']:9.2f}s"
+                f"{stage['peak_rss_delta_mb']:+9.1f} MB{rows:>14}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,100 @@
+"""
+Fused logistic regression scorer: scaler and category codes folded into lookup tables
+"""
+
+import numpy as np
+
+
+def is_logistic(model):
+    """True for a fitted binary linear model scored with a sigmoid (LogisticRegression)"""
+    return (
+        hasattr(model, "coef_")
+        and hasattr(model, "intercept_")
+        and np.shape(model.coef_)[0] == 1
+        and hasattr(model, "predict_proba")
+    )
+
+
+class FusedLogisticScorer:
+    """P(churn) = sigmoid(bias + sum of table lookups + numeric @ weights)
+
+    With scaled features z = (x - mean) / scale, the logistic margin
+    coef @ z + intercept is linear in the raw inputs. Each categorical
+    column contributes coef_j * (code - mean_j) / scale_j, precomputed for
+    every code (including the unknown bucket) in one flat table; numeric
+    columns get weights coef_k / scale_k and all constant terms go into
+    the bias. Scoring a batch is then one gather-sum over the int8 codes,
+    one small matrix-vector product and a sigmoid, with numpy only.
+    """
+
+    def __init__(self, categorical_columns, numeric_columns, table, offsets, weights, bias):
+        self.categorical_columns = list(categorical_columns)
+        self.numeric_columns = list(numeric_columns)
+        self.table = np.asarray(table, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Fold a ChurnPipeline's encoder, scaler and logistic model"""
+        coef = np.asarray(pipeline.model.coef_, dtype=np.float64)[0]
+        bias = float(np.asarray(pipeline.model.intercept_)[0])
+        mean, scale = pipeline.mean, pipeline.scale
+
+        tables, offsets, offset = [], [], 0
+        for j, col in zip(pipeline.categorical_index, pipeline.encoder.columns):
+            # Codes 0..len(vocabulary), the last one being the unknown bucket
+            codes = np.arange(pipeline.encoder.unknown_code(col) + 1, dtype=np.float64)
+            tables.append(coef[j] * (codes - mean[j]) / scale[j])
+            offsets.append(offset)
+            offset += len(codes)
+
+        numeric_index = [pipeline.feature_names.index(col) for col in pipeline.numeric_columns]
+        weights = coef[numeric_index] / scale[numeric_index]
+        bias -= float(weights @ mean[numeric_index])
+
+        return cls(
+            pipeline.encoder.columns,
+            pipeline.numeric_columns,
+            np.concatenate(tables) if tables else np.zeros(0),
+            offsets,
+            weights,
+            bias,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a scorer written by save() (a plain .npz, no pickled objects)"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["categorical_columns"].tolist(),
+                data["numeric_columns"].tolist(),
+                data["table"],
+                data["offsets"],
+                data["weights"],
+                data["bias"],
+            )
+
+    def save(self, path):
+        """Write the folded arrays as .npz, loadable with numpy alone"""
+        np.savez(
+            path,
+            categorical_columns=np.array(self.categorical_columns, dtype=str),
+            numeric_columns=np.array(self.numeric_columns, dtype=str),
+            table=self.table,
+            offsets=self.offsets,
+            weights=self.weights,
+            bias=np.float64(self.bias),
+        )
+        return path
+
+    def margin(self, codes, numeric):
+        """Log-odds of churn for (n, n_categorical) codes and (n, n_numeric) raw values"""
+        margin = np.take(self.table, codes + self.offsets).sum(axis=1)
+        margin += np.asarray(numeric, dtype=np.float64) @ self.weights
+        return margin + self.bias
+
+    def predict_proba(self, codes, numeric):
+        """P(churn) for every row"""
+        return 1 / (1 + np.exp(-self.margin(codes, numeric)))
@@ -0,0 +1,315 @@
+"""
+Fused inference pipeline: cleaning, encoding, scaling and a model in one artifact
+"""
+
+import os
+import sys
+import threading
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from encoding import CategoricalEncoder
+from linear_scorer import FusedLogisticScorer, is_logistic
+from prediction_cache import PREPROCESSING_ARTIFACTS, artifacts_version
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import MODELS_PATH
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+
+PIPELINE_FILENAME = "churn_pipeline.pkl"
+
+
+class ChurnPipeline:
+    """Ready-to-score bundle of the preprocessing artifacts and one model
+
+    predict_proba() takes raw telco-schema rows (as in telco_dataset.csv)
+    and applies the same cleaning, encoding and scaling as
+    ChurnDataProcessor. Features are written straight into one
+    preallocated matrix in feature_names order, without intermediate
+    DataFrames.
+
+    With a PredictionCache attached, rows whose encoded features were
+    scored before by the same model version are answered from the cache
+    and only the rest reach the model.
+    """
+
+    def __init__(self, encoders, scaler, feature_names, model, model_name=None, version=None, cache=None):
+        self.encoder = CategoricalEncoder.from_label_encoders(encoders)
+        self.target_classes = np.asarray(encoders["target"].classes_)
+        self.feature_names = list(feature_names)
+        self.model = model
+        self.model_name = model_name
+        self.version = version
+        self.cache = cache
+
+        # Column positions in the model's feature order
+        self.categorical_index = np.array(
+            [self.feature_names.index(col) for col in self.encoder.columns], dtype=np.intp
+        )
+        self.numeric_columns = [
+            col for col in self.feature_names if col not in self.encoder.columns
+        ]
+
+        # StandardScaler as per-feature affine constants
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        # Logistic regression is scored straight from the codes, without scaling
+        self.fused = FusedLogisticScorer.from_pipeline(self) if is_logistic(model) else None
+
+    @classmethod
+    def from_artifacts(cls, model_name="xgboost", models_path=MODELS_PATH):
+        """Build a pipeline from the .pkl files saved by the processing pipeline"""
+        encoders = joblib.load(f"{models_path}encoders.pkl")
+        scaler = joblib.load(f"{models_path}scaler.pkl")
+        feature_names = joblib.load(f"{models_path}feature_names.pkl")
+        model_path = f"{models_path}{model_name}.pkl"
+        version = artifacts_version(
+            [model_path] + [f"{models_path}{name}.pkl" for name in PREPROCESSING_ARTIFACTS]
+        )
+        model = joblib.load(model_path)
+        return cls(encoders, scaler, feature_names, model, model_name, version)
+
+    @staticmethod
+    def load(path=None):
+        """Load a pipeline saved with save()"""
+        return joblib.load(path or f"{MODELS_PATH}{PIPELINE_FILENAME}")
+
+    def save(self, path=None):
+        """Persist the whole pipeline as a single artifact"""
+        path = path or f"{MODELS_PATH}{PIPELINE_FILENAME}"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    def _numeric_features(self, raw):
+        """Cleaned numeric columns, including the derived AvgMonthlyCharges"""
+        tenure = pd.to_numeric(raw["tenure"], errors="coerce").to_numpy(np.float64)
+        total = pd.to_numeric(raw["TotalCharges"], errors="coerce").to_numpy(np.float64)
+        total = np.where(np.isnan(total), 0.0, total)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg = total / (tenure + 1)
+        avg[np.isinf(avg)] = 0.0
+
+        return {
+            "tenure": tenure,
+            "MonthlyCharges": pd.to_numeric(raw["MonthlyCharges"], errors="coerce").to_numpy(
+                np.float64
+            ),
+            "TotalCharges": total,
+            "AvgMonthlyCharges": avg,
+        }
+
+    def encode(self, raw):
+        """Category codes (n_rows, n_categorical) and unscaled numeric columns"""
+        if not isinstance(raw, pd.DataFrame):
+            raw = pd.DataFrame(raw)
+
+        codes = np.empty((len(raw), len(self.encoder.columns)), dtype=self.encoder.code_dtype)
+        for k, col in enumerate(self.encoder.columns):
+            series = raw[col]
+            if col == "SeniorCitizen" and pd.api.types.is_numeric_dtype(series):
+                series = series.map({0: "No", 1: "Yes"})
+            codes[:, k] = self.encoder.encode_column(series, col)
+
+        values = self._numeric_features(raw)
+        numeric = np.column_stack([values[col] for col in self.numeric_columns])
+        return codes, numeric
+
+    def transform(self, raw):
+        """Scaled feature matrix for raw telco-schema rows"""
+        return self._features(*self.encode(raw))
+
+    def _features(self, codes, numeric):
+        X = np.empty((len(codes), len(self.feature_names)), dtype=np.float64)
+        X[:, self.categorical_index] = codes
+        for k, col in enumerate(self.numeric_columns):
+            X[:, self.feature_names.index(col)] = numeric[:, k]
+
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def _score(self, codes, numeric):
+        """P(churn) of encoded rows"""
+        if getattr(self, "fused", None) is not None:
+            return self.fused.predict_proba(codes, numeric)
+
+        X = self._features(codes, numeric)
+        with warnings.catch_warnings():
+            # Models were fitted on DataFrames; the matrix has the same column order
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return self.model.predict_proba(X)[:, 1]
+
+    def _score_cached(self, codes, numeric, cache):
+        """P(churn) of encoded rows, scoring only the cache misses"""
+        rows = np.column_stack([codes, numeric]).astype(np.float64)
+        version = getattr(self, "version", None)
+        keys = [cache.key(version, row) for row in rows]
+        churn = np.array([cache.get(key) for key in keys], dtype=np.float64)
+
+        miss = np.flatnonzero(np.isnan(churn))
+        if len(miss):
+            churn[miss] = self._score(codes[miss], numeric[miss])
+            for i in miss:
+                cache.put(keys[i], float(churn[i]))
+        return churn
+
+    def predict_proba(self, raw):
+        """Class probabilities (n_rows, 2) for raw telco-schema rows"""
+        codes, numeric = self.encode(raw)
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            churn = self._score(codes, numeric)
+        else:
+            churn = self._score_cached(codes, numeric, cache)
+        return np.column_stack([1 - churn, churn])
+
+    def predict(self, raw, threshold=0.5):
+        """Predicted Churn labels ('No'/'Yes') for raw telco-schema rows"""
+        churn = self.predict_proba(raw)[:, 1] > threshold
+        return self.target_classes[churn.astype(int)]
+
+
+class RowScorer:
+    """Low-latency scoring of a single customer profile
+
+    Built from a ChurnPipeline: every category value is mapped straight to
+    its scaled code, numeric features use precomputed affine constants
+    (x - mean) / scale = a * x + b, and the row is written into one
+    preallocated array. Features missing from a profile are imputed at the
+    training mean (0 after scaling).
+
+    A PredictionCache keyed on the scaled row and the model version
+    answers repeated profiles without calling the model; give the scorer
+    a cache of its own, as its keys are not comparable with those of
+    ChurnPipeline.predict_proba.
+    """
+
+    def __init__(self, pipeline, cache=None):
+        self.model = pipeline.model
+        self.model_name = pipeline.model_name
+        self.version = getattr(pipeline, "version", None)
+        self.cache = cache
+        self.feature_names = pipeline.feature_names
+        self._row = np.zeros((1, len(self.feature_names)), dtype=np.float64)
+        self._lock = threading.Lock()
+
+        mean, scale = pipeline.mean, pipeline.scale
+        self._categorical = []
+        for j, col in zip(pipeline.categorical_index, pipeline.encoder.columns):
+            vocabulary = pipeline.encoder.vocabularies[col]
+            lookup = {
+                value: (code - mean[j]) / scale[j] for code, value in enumerate(vocabulary)
+            }
+            unknown = (len(vocabulary) - mean[j]) / scale[j]
+            self._categorical.append((j, col, lookup, unknown))
+
+        self._numeric = []
+        for col in pipeline.numeric_columns:
+            j = self.feature_names.index(col)
+            self._numeric.append((j, col, 1.0 / scale[j], -mean[j] / scale[j]))
+
+        self._predict = self._select_predict()
+
+        # Warm up once so the first request does not pay one-off setup costs
+        self._predict(self._row)
+
+    def _select_predict(self):
+        """Cheapest call that returns P(churn) for one row"""
+        model = self.model
+        if hasattr(model, "get_booster") or hasattr(model, "booster"):
+            # XGBoost trees as flat arrays: no wrapper, DMatrix or library call per row
+            from tree_engine import CompiledTrees
+
+            compiled = CompiledTrees.from_model(model)
+            return lambda row: float(compiled.predict_proba(row)[0, 1])
+
+        if is_logistic(model):
+            # The row is already scaled: one dot product and a sigmoid
+            coef = np.asarray(model.coef_, dtype=np.float64)[0]
+            intercept = float(np.asarray(model.intercept_)[0])
+            return lambda row: float(1 / (1 + np.exp(-(row[0] @ coef + intercept))))
+
+        def predict(row):
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="X does not have valid feature names")
+                return float(model.predict_proba(row)[0, 1])
+
+        return predict
+
+    def _numbers(self, profile):
+        """Numeric fields of a profile, with the derived AvgMonthlyCharges"""
+        numbers = {}
+        for _, col, _, _ in self._numeric:
+            if col in profile:
+                try:
+                    numbers[col] = float(profile[col])
+                except ValueError:
+                    if col != "TotalCharges":
+                        raise
+                    numbers[col] = 0.0
+
+        if (
+            "AvgMonthlyCharges" not in numbers
+            and "TotalCharges" in numbers
+            and "tenure" in numbers
+        ):
+            numbers["AvgMonthlyCharges"] = numbers["TotalCharges"] / (numbers["tenure"] + 1)
+        return numbers
+
+    def score(self, profile):
+        """Churn probability for one profile dict of raw telco fields"""
+        numbers = self._numbers(profile)
+
+        with self._lock:
+            row = self._row[0]
+            row[:] = 0.0
+
+            for j, col, lookup, unknown in self._categorical:
+                if col in profile:
+                    value = profile[col]
+                    if col == "SeniorCitizen":
+                        value = {0: "No", 1: "Yes"}.get(value, value)
+                    row[j] = lookup.get(str(value), unknown)
+
+            for j, col, a, b in self._numeric:
+                if col in numbers:
+                    row[j] = a * numbers[col] + b
+
+            if self.cache is None:
+                return self._predict(self._row)
+
+            key = self.cache.key(self.version, self._row)
+            churn = self.cache.get(key)
+            if churn is None:
+                churn = self._predict(self._row)
+                self.cache.put(key, churn)
+            return churn
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bundle the inference pipeline")
+    parser.add_argument("--model", default="xgboost", help="model file name in models/")
+    parser.add_argument("--output", default=None, help="output path of the artifact")
+    args = parser.parse_args()
+
+    try:
+        pipeline = ChurnPipeline.from_artifacts(args.model)
+    except FileNotFoundError as e:
+        print(f"❌ Missing artifact: {e.filename}")
+        print("   Run the data processing pipeline and train the models first")
+        sys.exit(1)
+
+    path = pipeline.save(args.output)
+    print(f"💾 Pipeline with {args.model} saved to {path}")
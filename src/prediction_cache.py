@@ -0,0 +1,117 @@
+"""
+Bounded LRU/TTL cache of churn scores keyed on encoded feature rows and the model version
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS
+except ImportError:
+    # Fallback configuration if config file is not found
+    PREDICTION_CACHE_MAX_ENTRIES = 100_000
+    PREDICTION_CACHE_TTL_SECONDS = 3600
+
+
+# Files saved by the processing pipeline that every model is scored with
+PREPROCESSING_ARTIFACTS = ("encoders", "scaler", "feature_names")
+
+
+def model_version(path):
+    """Version of a published model file; changes whenever the .pkl is replaced"""
+    stat = os.stat(path)
+    return f"{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def artifacts_version(paths):
+    """Combined version of several files, e.g. a model and its preprocessing artifacts"""
+    return "/".join(model_version(path) for path in paths)
+
+
+class PredictionCache:
+    """P(churn) of recently scored feature rows, LRU-evicted past max_entries
+
+    Keys are 128-bit BLAKE2b digests of the model version and the bytes of
+    an encoded row, so two requests that normalize to the same features
+    share an entry however their raw fields were written, and scores of
+    a replaced model are never served. Entries expire ttl_seconds after
+    they were stored; a ttl of None keeps them until evicted.
+    """
+
+    def __init__(self, max_entries=PREDICTION_CACHE_MAX_ENTRIES, ttl_seconds=PREDICTION_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __getstate__(self):
+        # Pickled (e.g. inside a saved pipeline) as an empty cache
+        return {"max_entries": self.max_entries, "ttl_seconds": self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def key(version, row):
+        """Digest of a model version and one encoded row (any contiguous buffer)"""
+        digest = hashlib.blake2b(str(version).encode(), digest_size=16)
+        digest.update(row)
+        return digest.digest()
+
+    def get(self, key):
+        """Cached score for key, or None"""
+        with self._lock:
+            entry = self._scores.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            score, expires = entry
+            if expires is not None and time.monotonic() >= expires:
+                del self._scores[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key, score):
+        """Store a score, evicting the least recently used entries over max_entries"""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._scores[key] = (score, expires)
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry, e.g. after a new model was published"""
+        with self._lock:
+            self._scores.clear()
+
+    def stats(self):
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._scores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
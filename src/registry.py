@@ -0,0 +1,197 @@
+"""
+Lazily loaded, memory-bounded registry of the trained models
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from prediction_cache import PREPROCESSING_ARTIFACTS, model_version
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import MODEL_MEMORY_BUDGET_MB, MODELS_CONFIG, MODELS_PATH
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    MODELS_CONFIG = {"logistic_regression": {}, "random_forest": {}, "xgboost": {}}
+    MODEL_MEMORY_BUDGET_MB = 1024
+
+
+def _rss_bytes():
+    """Resident set size of this process, 0 if it cannot be measured"""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class ModelRegistry:
+    """Trained models loaded on first use and evicted LRU over a memory budget
+
+    Nothing is unpickled until get() asks for a model, so start-up cost
+    and resident memory do not grow with the number of published models.
+    Each load records its time and resident size (RSS growth during the
+    load, at least the file size); when the loaded models exceed
+    memory_budget_mb the least recently used ones are dropped, together
+    with any objects derived from them. A model is versioned together with
+    the preprocessing artifacts it is scored with: when its .pkl or one of
+    them was replaced since it was loaded, the next get() reloads it and
+    drops its derived objects (row scorers, prediction caches), and
+    preprocessing() returns the new artifacts.
+    """
+
+    def __init__(self, names=None, models_path=MODELS_PATH, memory_budget_mb=MODEL_MEMORY_BUDGET_MB):
+        self.names = list(names or MODELS_CONFIG)
+        self.models_path = models_path
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.stats = {}
+        self._loaded = OrderedDict()
+        self._derived = {}
+        self._versions = {}
+        self._preprocessing = None
+        self._lock = threading.RLock()
+
+    def path(self, name):
+        return f"{self.models_path}{name}.pkl"
+
+    def available(self):
+        """Registered models that have a file to load"""
+        return [name for name in self.names if os.path.exists(self.path(name))]
+
+    def missing(self):
+        """Registered models whose file is not there"""
+        return [name for name in self.names if not os.path.exists(self.path(name))]
+
+    def _file_version(self, name):
+        try:
+            return model_version(self.path(name))
+        except FileNotFoundError:
+            return "missing"
+
+    def preprocessing_version(self):
+        """Version of the published encoders, scaler and feature names"""
+        return "/".join(self._file_version(name) for name in PREPROCESSING_ARTIFACTS)
+
+    def version(self, name):
+        """Version of the published model file and of its preprocessing artifacts"""
+        return f"{model_version(self.path(name))}/{self.preprocessing_version()}"
+
+    def preprocessing(self):
+        """(encoders, scaler, feature_names), reloaded when one of the files changes
+
+        Raises FileNotFoundError if the processing pipeline has not saved them.
+        """
+        with self._lock:
+            version = self.preprocessing_version()
+            if self._preprocessing is None or self._preprocessing[0] != version:
+                import joblib
+
+                artifacts = tuple(joblib.load(self.path(name)) for name in PREPROCESSING_ARTIFACTS)
+                self._preprocessing = (version, artifacts)
+            return self._preprocessing[1]
+
+    @property
+    def resident_bytes(self):
+        return sum(self.stats[name]["size_bytes"] for name in self._loaded)
+
+    def get(self, name):
+        """The model, loading it on first use (FileNotFoundError if missing)"""
+        with self._lock:
+            if name in self._loaded:
+                try:
+                    published = self.version(name)
+                except FileNotFoundError:
+                    published = self._versions[name]
+                if published == self._versions[name]:
+                    self._loaded.move_to_end(name)
+                    return self._loaded[name]
+                # A new model was published: drop the old one and what was built from it
+                self.unload(name)
+
+            if name not in self.names:
+                raise KeyError(f"Unknown model '{name}'")
+
+            # Deferred so that listing models does not import joblib
+            import joblib
+
+            version = self.version(name)
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = joblib.load(self.path(name))
+            load_seconds = time.perf_counter() - start
+            size_bytes = max(_rss_bytes() - rss_before, os.path.getsize(self.path(name)))
+
+            stats = self.stats.setdefault(name, {"loads": 0})
+            stats.update(
+                loads=stats["loads"] + 1,
+                load_seconds=load_seconds,
+                size_bytes=size_bytes,
+            )
+            self._loaded[name] = model
+            self._versions[name] = version
+            self._evict(keep=name)
+            return model
+
+    def derived(self, name, key, build):
+        """An object built from a model (e.g. a row scorer), dropped with it"""
+        with self._lock:
+            model = self.get(name)
+            cache = self._derived.setdefault(name, {})
+            if key not in cache:
+                cache[key] = build(model)
+            return cache[key]
+
+    def loaded(self):
+        """Names of the models currently in memory, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def _evict(self, keep):
+        while self.resident_bytes > self.memory_budget and len(self._loaded) > 1:
+            name = next(iter(self._loaded))
+            if name == keep:
+                self._loaded.move_to_end(name)
+                continue
+            self.unload(name)
+
+    def unload(self, name):
+        """Drop a model and everything derived from it"""
+        with self._lock:
+            self._loaded.pop(name, None)
+            self._derived.pop(name, None)
+            self._versions.pop(name, None)
+
+    def report(self):
+        """Per-model status, load time and resident size"""
+        with self._lock:
+            missing = set(self.missing())
+            report = []
+            for name in self.names:
+                stats = self.stats.get(name, {})
+                if name in missing:
+                    status = "missing"
+                elif name in self._loaded:
+                    status = "loaded"
+                else:
+                    status = "not loaded"
+                report.append(
+                    {
+                        "model": name,
+                        "status": status,
+                        "loads": stats.get("loads", 0),
+                        "load_seconds": stats.get("load_seconds"),
+                        "size_mb": stats["size_bytes"] / 1024 / 1024 if stats else None,
+                    }
+                )
+            return report
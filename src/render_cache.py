@@ -0,0 +1,90 @@
+"""
+Render cache for dashboard figures: rasterized once, served as PNG bytes
+"""
+
+import io
+import sys
+import threading
+from collections import OrderedDict
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import FIGURE_CACHE_MAX_BYTES
+except ImportError:
+    # Fallback configuration if config file is not found
+    FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Same rasterization as st.pyplot
+SAVEFIG_OPTIONS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+
+class FigureCache:
+    """LRU cache of rendered figures, capped by total size in bytes
+
+    Keys identify what a figure shows, e.g. (page, analysis type, data
+    fingerprint). On a hit the stored PNG is returned without touching
+    matplotlib; on a miss render() builds the figure, which is rasterized,
+    closed and stored, evicting the least recently used figures to stay
+    under max_bytes.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def get(self, key):
+        """Cached PNG bytes for key, or None"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image):
+        """Store PNG bytes, evicting least recently used entries over the cap"""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._images:
+                self.size -= len(self._images.pop(key))
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_or_render(self, key, render):
+        """PNG bytes for key, calling render() -> Figure only on a miss"""
+        image = self.get(key)
+        if image is None:
+            image = rasterize(render())
+            self.put(key, image)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.size = 0
+
+
+def rasterize(fig):
+    """PNG bytes of a matplotlib figure, closing it afterwards"""
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
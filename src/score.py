@@ -0,0 +1,233 @@
+"""
+Batch scoring: stream a raw customer file through a trained model
+
+Usage (from the project root):
+    python src/score.py data/raw/telco_dataset.csv --model xgboost
+    python src/score.py customers.parquet --model xgboost --workers 32
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pipeline import ChurnPipeline
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import CHUNK_SIZE, RAW_DATA_PATH, REPORTS_PATH
+except ImportError:
+    # Fallback configuration if config file is not found
+    CHUNK_SIZE = 100_000
+    RAW_DATA_PATH = "../data/raw/telco_dataset.csv"
+    REPORTS_PATH = "../reports/"
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield DataFrame chunks of a raw telco-format CSV or Parquet file"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ScoreWriter:
+    """Append customerID/churn_probability rows to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, scores):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(scores, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            write_header = self._file is None
+            if write_header:
+                self._file = open(self.path, "w", newline="")
+            scores.to_csv(self._file, header=write_header, index=False)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def score_chunk(pipeline, chunk):
+    """customerID and churn probability for one raw chunk"""
+    return pd.DataFrame(
+        {
+            "customerID": chunk["customerID"].to_numpy(),
+            "churn_probability": pipeline.predict_proba(chunk)[:, 1],
+        }
+    )
+
+
+# Pipeline used by pool workers: inherited from the parent under fork,
+# loaded once per worker otherwise
+_worker_pipeline = None
+
+
+def _limit_threads(pipeline):
+    """One compute thread per worker process, so workers do not oversubscribe"""
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+    model = pipeline.model
+    # Estimators with an n_jobs parameter (XGBoost, random forest) and boosting.BoosterClassifier
+    if hasattr(model, "booster") or "n_jobs" in getattr(model, "get_params", dict)():
+        model.set_params(n_jobs=1)
+
+
+def _init_worker(model_name, pipeline_path):
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        if pipeline_path:
+            _worker_pipeline = ChurnPipeline.load(pipeline_path)
+        else:
+            _worker_pipeline = ChurnPipeline.from_artifacts(model_name)
+    _limit_threads(_worker_pipeline)
+
+
+def _score_in_worker(chunk):
+    return score_chunk(_worker_pipeline, chunk)
+
+
+def _scored_chunks(pipeline, input_path, chunk_size, workers, pipeline_path):
+    """Yield scored chunks in input order, fanning out across processes"""
+    if workers <= 1:
+        for chunk in iter_chunks(input_path, chunk_size):
+            yield len(chunk), score_chunk(pipeline, chunk)
+        return
+
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+
+    # Bounded window of in-flight chunks keeps memory proportional to workers,
+    # and collecting futures in submission order keeps the output deterministic
+    pending = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(pipeline.model_name, pipeline_path),
+    ) as executor:
+        for chunk in iter_chunks(input_path, chunk_size):
+            pending.append((len(chunk), executor.submit(_score_in_worker, chunk)))
+            if len(pending) >= 2 * workers:
+                n_rows, future = pending.popleft()
+                yield n_rows, future.result()
+        while pending:
+            n_rows, future = pending.popleft()
+            yield n_rows, future.result()
+
+
+def score_file(
+    pipeline,
+    input_path,
+    output_path,
+    chunk_size=CHUNK_SIZE,
+    workers=1,
+    pipeline_path=None,
+    verbose=True,
+):
+    """Score a raw file chunk by chunk, writing results as they are produced
+
+    With workers > 1, chunks are scored in a process pool and written back
+    in input order. Memory is bounded by chunk size times the number of
+    in-flight chunks. Returns the number of rows scored and the elapsed
+    time in seconds.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    total_rows = 0
+    start = time.perf_counter()
+    with ScoreWriter(output_path) as writer:
+        chunks = _scored_chunks(pipeline, input_path, chunk_size, workers, pipeline_path)
+        for i, (n_rows, scores) in enumerate(chunks):
+            writer.write(scores)
+            total_rows += n_rows
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"   Chunk {i + 1}: {total_rows:,} rows scored "
+                    f"({total_rows / elapsed:,.0f} rows/s)"
+                )
+    return total_rows, time.perf_counter() - start
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a raw customer file for churn")
+    parser.add_argument("input", nargs="?", default=RAW_DATA_PATH, help="raw CSV or Parquet file")
+    parser.add_argument("--model", default="xgboost", help="model file name in models/")
+    parser.add_argument(
+        "--pipeline", default=None, help="saved ChurnPipeline artifact to use instead of --model"
+    )
+    parser.add_argument(
+        "--output",
+        default=f"{REPORTS_PATH}churn_scores.csv",
+        help="output CSV or Parquet file",
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="scoring processes (default: 1)"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Input file not found: {args.input}")
+        return False
+
+    try:
+        if args.pipeline:
+            pipeline = ChurnPipeline.load(args.pipeline)
+        else:
+            pipeline = ChurnPipeline.from_artifacts(args.model)
+    except FileNotFoundError as e:
+        print(f"❌ Missing artifact: {e.filename}")
+        return False
+
+    print(f"🔮 Scoring {args.input} with {pipeline.model_name} ({args.workers} workers)...")
+    total_rows, elapsed = score_file(
+        pipeline,
+        args.input,
+        args.output,
+        args.chunk_size,
+        workers=args.workers,
+        pipeline_path=args.pipeline,
+    )
+
+    print(f"💾 Scores written to {args.output}")
+    print(f"✅ {total_rows:,} rows in {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/s)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
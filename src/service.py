@@ -0,0 +1,306 @@
+"""
+Asynchronous HTTP scoring service: POST /score with micro-batching
+
+Usage (from the project root):
+    python src/service.py --model xgboost --port 8080
+    curl -X POST localhost:8080/score -d @customer.json
+
+/score takes one raw telco-schema record (a JSON object, as in
+telco_dataset.csv) or a list of records, and returns churn_probability
+as a number or a list. GET /health reports the model, batching and
+prediction cache stats.
+"""
+
+import asyncio
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pandas as pd
+
+from pipeline import ChurnPipeline
+from prediction_cache import PredictionCache
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import (
+        SERVICE_BATCH_WINDOW_MS,
+        SERVICE_HOST,
+        SERVICE_MAX_BATCH,
+        SERVICE_MODEL,
+        SERVICE_PORT,
+    )
+except ImportError:
+    # Fallback configuration if config file is not found
+    SERVICE_HOST = "127.0.0.1"
+    SERVICE_PORT = 8080
+    SERVICE_MODEL = "xgboost"
+    SERVICE_BATCH_WINDOW_MS = 2.0
+    SERVICE_MAX_BATCH = 512
+
+MAX_BODY_BYTES = 1024 * 1024
+NUMERIC_FIELDS = ["tenure", "MonthlyCharges", "TotalCharges"]
+# Must parse as finite numbers; a blank TotalCharges is a new customer (0)
+REQUIRED_NUMBERS = ["tenure", "MonthlyCharges"]
+
+
+def _is_number(value):
+    try:
+        return math.isfinite(float(value))
+    except (TypeError, ValueError):
+        return False
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into one model call
+
+    Requests are queued with a future. The batching loop takes the first
+    waiting request, gives others window_ms to arrive, then scores up to
+    max_batch records in one predict_proba call on a worker thread, so
+    the event loop keeps accepting requests while a batch is scored.
+    Under load the next batch fills while the current one is scored.
+    """
+
+    def __init__(self, pipeline, window_ms=SERVICE_BATCH_WINDOW_MS, max_batch=SERVICE_MAX_BATCH):
+        self.pipeline = pipeline
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.stats = {"requests": 0, "records": 0, "batches": 0, "scoring_seconds": 0.0}
+        self._queue = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+
+    async def score(self, records):
+        """P(churn) for a list of raw records, scored with other pending requests"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((records, future))
+        return await future
+
+    async def run(self):
+        self._queue = asyncio.Queue()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            if size < self.max_batch and self.window > 0 and self._queue.qsize() < self.max_batch:
+                await asyncio.sleep(self.window)
+            while size < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                pending.append(item)
+                size += len(item[0])
+            await self._score_batch(pending)
+
+    def _predict(self, records):
+        start = time.perf_counter()
+        churn = self.pipeline.predict_proba(pd.DataFrame.from_records(records))[:, 1]
+        self.stats["scoring_seconds"] += time.perf_counter() - start
+        return churn.tolist()
+
+    async def _score_batch(self, pending):
+        loop = asyncio.get_running_loop()
+        records = [record for batch, _ in pending for record in batch]
+        try:
+            churn = await loop.run_in_executor(self._executor, self._predict, records)
+        except Exception:
+            # Score requests one by one, so a bad record only fails its own request
+            for batch, future in pending:
+                try:
+                    result = await loop.run_in_executor(self._executor, self._predict, batch)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    self.stats["requests"] += 1
+                    self.stats["records"] += len(batch)
+                    self.stats["batches"] += 1
+                    if not future.done():
+                        future.set_result(result)
+            return
+
+        self.stats["requests"] += len(pending)
+        self.stats["records"] += len(records)
+        self.stats["batches"] += 1
+        start = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(churn[start:start + len(batch)])
+            start += len(batch)
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) on asyncio streams"""
+
+    def __init__(self, pipeline, window_ms=SERVICE_BATCH_WINDOW_MS, max_batch=SERVICE_MAX_BATCH):
+        self.pipeline = pipeline
+        self.batcher = MicroBatcher(pipeline, window_ms, max_batch)
+        self.required_fields = [*pipeline.encoder.columns, *NUMERIC_FIELDS]
+
+    def _validate(self, payload):
+        """Records of a /score body, or an error message"""
+        records = [payload] if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return None, "expected a JSON object or a list of objects"
+        for i, record in enumerate(records):
+            missing = [field for field in self.required_fields if field not in record]
+            if missing:
+                return None, f"record {i} is missing fields: {', '.join(missing)}"
+            invalid = [field for field in REQUIRED_NUMBERS if not _is_number(record[field])]
+            if invalid:
+                return None, f"record {i} has non-numeric fields: {', '.join(invalid)}"
+        return records, None
+
+    async def route(self, method, path, body):
+        """(status, JSON payload) for one request"""
+        if path == "/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use GET"}
+            stats = self.batcher.stats
+            cache = self.pipeline.cache
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "model": self.pipeline.model_name,
+                **stats,
+                "mean_batch_records": stats["records"] / stats["batches"] if stats["batches"] else 0,
+                "cache": cache.stats() if cache is not None else None,
+            }
+
+        if path != "/score":
+            return HTTPStatus.NOT_FOUND, {"error": f"no route for {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "body is not valid JSON"}
+        records, error = self._validate(payload)
+        if error:
+            return HTTPStatus.BAD_REQUEST, {"error": error}
+        if not records:
+            return HTTPStatus.OK, {"model": self.pipeline.model_name, "churn_probability": []}
+
+        try:
+            churn = await self.batcher.score(records)
+        except Exception as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"could not score records: {e}"}
+        if not all(math.isfinite(p) for p in churn):
+            return HTTPStatus.BAD_REQUEST, {"error": "records could not be scored to a probability"}
+        return HTTPStatus.OK, {
+            "model": self.pipeline.model_name,
+            "churn_probability": churn[0] if isinstance(payload, dict) else churn,
+        }
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it is closed"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "malformed request"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(
+                        writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}, False
+                    )
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (
+                    version == "HTTP/1.1" and connection != "close"
+                )
+
+                status, payload = await self.route(method, target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        try:
+            body = json.dumps(payload, allow_nan=False).encode()
+        except ValueError:
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            body = json.dumps({"error": "response is not valid JSON"}).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, ready=None):
+        """Run until cancelled; ready() is called once the socket is listening"""
+        batching = asyncio.create_task(self.batcher.run())
+        # Large backlog: thousands of callers may connect at once
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        if ready:
+            ready()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batching.cancel()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve churn scores over HTTP")
+    parser.add_argument("--model", default=SERVICE_MODEL, help="model file name in models/")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--window-ms", type=float, default=SERVICE_BATCH_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=SERVICE_MAX_BATCH)
+    parser.add_argument("--no-cache", action="store_true", help="score every record with the model")
+    args = parser.parse_args()
+
+    try:
+        pipeline = ChurnPipeline.from_artifacts(args.model)
+    except FileNotFoundError as e:
+        print(f"❌ Missing artifact: {e.filename}")
+        return False
+    if not args.no_cache and pipeline.fused is None:
+        # Repeated customers are answered from the cache, keyed on their encoded
+        # features; the fused logistic scorer is cheaper than a lookup
+        pipeline.cache = PredictionCache()
+
+    service = ScoringService(pipeline, args.window_ms, args.max_batch)
+
+    def ready():
+        print(
+            f"🚀 Serving {args.model} on http://{args.host}:{args.port}/score "
+            f"(batch window {args.window_ms:g} ms, up to {args.max_batch} records)",
+            flush=True,
+        )
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        print("👋 Service stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,277 @@
+"""
+Storage helpers for processed artifacts (CSV, Parquet or Arrow IPC/Feather)
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import PROCESSED_DATA_PATH, PROCESSED_DATA_FORMAT, CATEGORICAL_FEATURES
+except ImportError:
+    # Fallback configuration if config file is not found
+    PROCESSED_DATA_PATH = "../data/processed/"
+    PROCESSED_DATA_FORMAT = "csv"
+    CATEGORICAL_FEATURES = []
+
+FILE_EXTENSIONS = {"csv": "csv", "parquet": "parquet", "feather": "arrow"}
+
+# Text columns with one value per customer stay plain strings
+HIGH_CARDINALITY_COLUMNS = ["customerID"]
+
+
+def processed_path(name, data_format=None):
+    """Path of a processed artifact (e.g. 'train_data') in the given format"""
+    data_format = data_format or PROCESSED_DATA_FORMAT
+    if data_format not in FILE_EXTENSIONS:
+        raise ValueError(
+            f"Unknown data format '{data_format}', expected one of {list(FILE_EXTENSIONS)}"
+        )
+    return f"{PROCESSED_DATA_PATH}{name}.{FILE_EXTENSIONS[data_format]}"
+
+
+def to_columnar(df):
+    """Convert low-cardinality text columns to pandas categoricals
+
+    Arrow stores categoricals as dictionary-encoded columns, so each distinct
+    value is written once and read back without re-parsing strings.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col in HIGH_CARDINALITY_COLUMNS:
+            continue
+        if not pd.api.types.is_numeric_dtype(df[col]) and not isinstance(
+            df[col].dtype, pd.CategoricalDtype
+        ):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def compact_dtypes(df, max_category_ratio=0.5):
+    """Downcast a frame to compact dtypes based on the observed values
+
+    CATEGORICAL_FEATURES and other low-cardinality text columns become
+    pandas categoricals, integers shrink to the smallest type that holds
+    their range (e.g. int8 for tenure) and floats become float32. Returns
+    the compacted frame and a report of memory_usage(deep=True) before and
+    after.
+    """
+    before_bytes = int(df.memory_usage(deep=True).sum())
+    df = df.copy(deep=False)
+
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if col in CATEGORICAL_FEATURES:
+            df[col] = series.astype("category")
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="float")
+        elif series.nunique() <= max_category_ratio * len(series):
+            df[col] = series.astype("category")
+
+    after_bytes = int(df.memory_usage(deep=True).sum())
+    report = {
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "reduction": 1 - after_bytes / before_bytes if before_bytes else 0.0,
+    }
+    return df, report
+
+
+def write_processed(df, name, data_format=None):
+    """Write a processed frame in the configured format"""
+    data_format = data_format or PROCESSED_DATA_FORMAT
+    path = processed_path(name, data_format)
+
+    if data_format == "csv":
+        df.to_csv(path, index=False)
+    elif data_format == "parquet":
+        to_columnar(df).to_parquet(path, index=False)
+    else:
+        to_columnar(df).reset_index(drop=True).to_feather(path)
+    return path
+
+
+def resolve_processed(name, data_format=None):
+    """Path and format of a processed artifact, falling back to CSV
+
+    Returns (None, None) when the artifact does not exist in either format.
+    """
+    data_format = data_format or PROCESSED_DATA_FORMAT
+    for candidate in (data_format, "csv"):
+        path = processed_path(name, candidate)
+        if os.path.exists(path):
+            return path, candidate
+    return None, None
+
+
+def read_processed(name, data_format=None):
+    """Read a processed frame, falling back to CSV if only CSV exists"""
+    path, data_format = resolve_processed(name, data_format)
+    if path is None:
+        raise FileNotFoundError(f"Processed data '{name}' not found in {PROCESSED_DATA_PATH}")
+
+    if data_format == "csv":
+        return pd.read_csv(path)
+    if data_format == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+
+def feature_matrix_paths(split):
+    """Paths of the float32 matrix, label vector and JSON header of a split"""
+    prefix = f"{PROCESSED_DATA_PATH}{split}"
+    return f"{prefix}_features.npy", f"{prefix}_labels.npy", f"{prefix}_matrix.json"
+
+
+def write_feature_matrix(X, y, split):
+    """Write a split as a contiguous float32 matrix plus label vector
+
+    The header records feature names and shape, so the matrix can be mapped
+    without parsing text.
+    """
+    features_path, labels_path, header_path = feature_matrix_paths(split)
+    feature_names = list(getattr(X, "columns", range(np.shape(X)[1])))
+
+    matrix = np.ascontiguousarray(X, dtype=np.float32)
+    np.save(features_path, matrix)
+    np.save(labels_path, np.asarray(y, dtype=np.int8))
+    _write_matrix_header(header_path, feature_names, matrix.shape[0])
+
+
+def _write_matrix_header(header_path, feature_names, n_rows):
+    header = {
+        "feature_names": [str(name) for name in feature_names],
+        "n_rows": int(n_rows),
+        "dtype": "float32",
+    }
+    with open(header_path, "w") as f:
+        json.dump(header, f, indent=2)
+
+
+def load_feature_matrix(split, as_frame=False):
+    """Memory-map a split written by write_feature_matrix (zero copies)
+
+    Returns (X, y, feature_names). The arrays are read-only views of the
+    files, so processes loading the same split share page-cache pages.
+    With as_frame=True, X and y are wrapped in a DataFrame/Series without
+    copying.
+    """
+    features_path, labels_path, header_path = feature_matrix_paths(split)
+    with open(header_path) as f:
+        header = json.load(f)
+
+    X = np.load(features_path, mmap_mode="r")
+    y = np.load(labels_path, mmap_mode="r")
+    feature_names = header["feature_names"]
+    if X.shape != (header["n_rows"], len(feature_names)) or len(y) != X.shape[0]:
+        raise ValueError(f"Feature matrix for '{split}' does not match its header")
+
+    if as_frame:
+        X = pd.DataFrame(X, columns=feature_names, copy=False)
+        y = pd.Series(y, name="Churn", copy=False)
+    return X, y, feature_names
+
+
+class FeatureMatrixWriter:
+    """Fill a preallocated on-disk feature matrix chunk by chunk
+
+    Used by the streaming pipeline, which knows the split sizes after its
+    first pass.
+    """
+
+    def __init__(self, split, n_rows, feature_names):
+        features_path, labels_path, header_path = feature_matrix_paths(split)
+        n_features = len(feature_names)
+        self.X = np.lib.format.open_memmap(
+            features_path, mode="w+", dtype=np.float32, shape=(n_rows, n_features)
+        )
+        self.y = np.lib.format.open_memmap(
+            labels_path, mode="w+", dtype=np.int8, shape=(n_rows,)
+        )
+        _write_matrix_header(header_path, feature_names, n_rows)
+        self.rows_written = 0
+
+    def write(self, X, y):
+        """Copy the next block of rows into the mapped files"""
+        end = self.rows_written + len(X)
+        self.X[self.rows_written:end] = np.asarray(X, dtype=np.float32)
+        self.y[self.rows_written:end] = np.asarray(y, dtype=np.int8)
+        self.rows_written = end
+
+    def close(self):
+        """Flush the mapped files to disk"""
+        self.X.flush()
+        self.y.flush()
+
+
+class ProcessedChunkWriter:
+    """Append chunks to a processed artifact without holding the whole frame
+
+    CSV chunks are appended as text, Parquet chunks become row groups and
+    Feather chunks become record batches of one Arrow IPC file.
+    """
+
+    def __init__(self, name, data_format=None):
+        self.data_format = data_format or PROCESSED_DATA_FORMAT
+        self.path = processed_path(name, self.data_format)
+        self.rows_written = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk):
+        """Append one chunk"""
+        if self.data_format == "csv":
+            write_header = self._file is None
+            if write_header:
+                self._file = open(self.path, "w", newline="")
+            chunk.to_csv(self._file, header=write_header, index=False)
+        else:
+            self._write_arrow(to_columnar(chunk))
+        self.rows_written += len(chunk)
+
+    def _write_arrow(self, chunk):
+        import pyarrow as pa
+
+        if self._writer is None:
+            schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            if self.data_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, schema)
+            else:
+                # IPC files allow one dictionary per field, and category sets
+                # differ between chunks, so Feather chunks store plain strings
+                for i, field in enumerate(schema):
+                    if pa.types.is_dictionary(field.type):
+                        schema = schema.set(i, field.with_type(field.type.value_type))
+                self._writer = pa.ipc.new_file(self.path, schema)
+            self._schema = schema
+
+        self._writer.write_table(
+            pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        )
+
+    def close(self):
+        """Flush and close the underlying file"""
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,208 @@
+"""
+Incrementally maintained dashboard summary (data_summary.pkl)
+"""
+
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import CATEGORICAL_FEATURES, MODELS_PATH
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    CATEGORICAL_FEATURES = ["Contract", "PaymentMethod", "InternetService"]
+
+SUMMARY_STATE_FILENAME = "summary_state.db"
+
+# data_summary keys listing the distinct values of a column
+VALUE_COLUMNS = {
+    "contract_types": "Contract",
+    "payment_methods": "PaymentMethod",
+    "internet_services": "InternetService",
+}
+
+# Categorical values kept per customer: the summary's value lists and the
+# dimensions of the aggregate cube, which a delta updates from them
+DIMENSION_COLUMNS = list(dict.fromkeys([*VALUE_COLUMNS.values(), *CATEGORICAL_FEATURES]))
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS customers (
+    customerID TEXT PRIMARY KEY,
+    churned INTEGER NOT NULL,
+    monthly REAL NOT NULL,
+    tenure REAL NOT NULL,
+    {", ".join(f"{col} TEXT" for col in DIMENSION_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS value_counts (
+    column_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (column_name, value)
+);
+"""
+
+CONTRIBUTION_COLUMNS = ["customerID", "churned", "monthly", "tenure", *DIMENSION_COLUMNS]
+TOTAL_NAMES = ["rows", "churned", "monthly", "tenure"]
+
+
+def _contributions(df):
+    """What each customer adds to the summary, one row per customerID"""
+    frame = pd.DataFrame(
+        {
+            "customerID": df["customerID"].astype(str),
+            "churned": df["Churn"].astype(str).eq("Yes").astype(int),
+            "monthly": df["MonthlyCharges"].astype(float),
+            "tenure": df["tenure"].astype(float),
+        }
+    )
+    for col in DIMENSION_COLUMNS:
+        frame[col] = df[col].astype(str)
+    # Within one delta the last record of a customer wins
+    return frame.drop_duplicates("customerID", keep="last")
+
+
+class SummaryStore:
+    """Running sums, counts and value sets behind data_summary, keyed by customerID
+
+    Every customer's contribution is kept in a SQLite table. Applying a
+    delta subtracts the stored contribution of customers it updates and
+    adds the new one, so refresh cost is proportional to the delta and
+    applying the same delta twice leaves the summary unchanged.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or f"{MODELS_PATH}{SUMMARY_STATE_FILENAME}"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(_SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(customers)")]
+        # State written before the customers table had these columns
+        self.stale = columns != CONTRIBUTION_COLUMNS
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def reset(self):
+        """Drop all state, before rebuilding from the full history"""
+        with self.connection:
+            for table in ["customers", "totals", "value_counts"]:
+                self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+        self.connection.executescript(_SCHEMA)
+        self.stale = False
+
+    def replaced(self, df):
+        """Stored records of the customers in df, as a cleaned frame (Churn,
+        MonthlyCharges, tenure and the categorical columns)"""
+        stored = self._stored(df["customerID"].astype(str).unique())
+        return stored.rename(columns={"monthly": "MonthlyCharges"}).assign(
+            Churn=stored["churned"].map({1: "Yes", 0: "No"})
+        )
+
+    def charge_range(self):
+        """MonthlyCharges min and max per churn label (False/True), over all customers"""
+        rows = self.connection.execute(
+            "SELECT churned, MIN(monthly), MAX(monthly) FROM customers GROUP BY churned"
+        ).fetchall()
+        return pd.DataFrame(
+            [(min_, max_) for _, min_, max_ in rows],
+            index=pd.Index([bool(churned) for churned, _, _ in rows]),
+            columns=["min", "max"],
+        )
+
+    def _stored(self, customer_ids):
+        """Stored contributions of the given customers (only those present)"""
+        self.connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS delta_ids (customerID TEXT PRIMARY KEY)"
+        )
+        self.connection.execute("DELETE FROM delta_ids")
+        self.connection.executemany(
+            "INSERT INTO delta_ids VALUES (?)", ((cid,) for cid in customer_ids)
+        )
+        rows = self.connection.execute(
+            f"SELECT {', '.join(f'c.{col}' for col in CONTRIBUTION_COLUMNS)} "
+            "FROM customers c JOIN delta_ids d ON c.customerID = d.customerID"
+        ).fetchall()
+        return pd.DataFrame(rows, columns=CONTRIBUTION_COLUMNS)
+
+    def apply(self, df):
+        """Merge new and updated customer records (a cleaned frame) into the state
+
+        Returns the number of inserted and of updated customers.
+        """
+        if self.stale:
+            raise RuntimeError(
+                f"{self.path} predates the current summary schema; rerun the full pipeline"
+            )
+        new = _contributions(df)
+        with self.connection:
+            old = self._stored(new["customerID"])
+
+            totals = {
+                "rows": len(new) - len(old),
+                "churned": int(new["churned"].sum() - old["churned"].sum()),
+                "monthly": float(new["monthly"].sum() - old["monthly"].sum()),
+                "tenure": float(new["tenure"].sum() - old["tenure"].sum()),
+            }
+            self.connection.executemany(
+                "INSERT INTO totals VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                totals.items(),
+            )
+
+            for col in VALUE_COLUMNS.values():
+                change = new[col].value_counts().sub(old[col].value_counts(), fill_value=0)
+                # Insert values in first-seen order, which summary() reports
+                change = change.reindex(pd.unique(pd.concat([new[col], old[col]])))
+                change = change[change != 0]
+                self.connection.executemany(
+                    "INSERT INTO value_counts VALUES (?, ?, ?) "
+                    "ON CONFLICT(column_name, value) DO UPDATE SET count = count + excluded.count",
+                    ((col, value, int(count)) for value, count in change.items()),
+                )
+
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO customers VALUES ({', '.join('?' * len(CONTRIBUTION_COLUMNS))})",
+                new.itertuples(index=False, name=None),
+            )
+
+        return len(new) - len(old), len(old)
+
+    def summary(self):
+        """The data_summary dict, read from the running totals"""
+        totals = dict.fromkeys(TOTAL_NAMES, 0.0)
+        totals.update(self.connection.execute("SELECT name, value FROM totals").fetchall())
+        rows = int(totals["rows"])
+
+        data_summary = {
+            "total_customers": rows,
+            "churned_customers": int(totals["churned"]),
+            "churn_rate": totals["churned"] / rows if rows else 0.0,
+            "avg_monthly_charges": totals["monthly"] / rows if rows else 0.0,
+            "avg_tenure": totals["tenure"] / rows if rows else 0.0,
+        }
+        for key, col in VALUE_COLUMNS.items():
+            # First-seen order, as unique() on the full frame
+            data_summary[key] = [
+                value
+                for (value,) in self.connection.execute(
+                    "SELECT value FROM value_counts WHERE column_name = ? AND count > 0 "
+                    "ORDER BY rowid",
+                    (col,),
+                )
+            ]
+        return data_summary
@@ -0,0 +1,247 @@
+"""
+Model training: fit every model in MODELS_CONFIG concurrently within a CPU budget
+
+Usage (from the project root):
+    python src/train.py
+    python src/train.py --models xgboost random_forest --n-jobs 8
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tuning import THREADED_MODELS, build_model
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import (
+        MODELS_CONFIG,
+        MODELS_PATH,
+        REPORTS_PATH,
+        TRAINING_N_JOBS,
+        XGBOOST_EXTERNAL_MEMORY,
+    )
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    REPORTS_PATH = "../reports/"
+    MODELS_CONFIG = {"logistic_regression": {}, "random_forest": {}, "xgboost": {}}
+    TRAINING_N_JOBS = -1
+    XGBOOST_EXTERNAL_MEMORY = False
+
+COMPARISON_RESULTS_FILENAME = "model_comparison_results.pkl"
+# Keys of the comparison results, as written by notebooks/03_xgboost_training.ipynb;
+# the MODELS_CONFIG XGBoost is the notebook's basic one
+COMPARISON_NAMES = {
+    "logistic_regression": "Logistic Regression",
+    "random_forest": "Random Forest",
+    "xgboost": "XGBoost (Basic)",
+}
+
+
+def cpu_budget(n_jobs):
+    """Number of cores for n_jobs, with joblib's convention for negative values"""
+    n_cpus = os.cpu_count() or 1
+    if n_jobs < 0:
+        return max(1, n_cpus + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def plan_threads(names, n_jobs=TRAINING_N_JOBS):
+    """Worker processes and threads per multi-threaded fit within the budget
+
+    Every model gets its own process while cores allow. Single-threaded
+    models (logistic regression) take one core each and the remaining
+    cores are split between the multi-threaded ones.
+    """
+    budget = cpu_budget(n_jobs)
+    workers = min(len(names), budget)
+    threaded = [name for name in names if name in THREADED_MODELS]
+    single = len(names) - len(threaded)
+
+    spare = budget - min(single, workers)
+    threads = max(1, spare // max(1, min(len(threaded), workers)))
+    return workers, threads
+
+
+def _peak_rss_bytes():
+    """Peak resident set size of this process so far"""
+    try:
+        import resource
+
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except ImportError:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset
+
+
+def _fit(name, threads, external_memory):
+    """Fitted model for one MODELS_CONFIG entry
+
+    XGBoost is trained natively from the memory-mapped matrix (see
+    boosting.fit_booster); the other models are fitted on the DataFrame view.
+    """
+    from storage import load_feature_matrix
+
+    if name == "xgboost":
+        from boosting import fit_booster_from_artifacts
+
+        return fit_booster_from_artifacts(
+            "train", n_jobs=threads, external_memory=external_memory
+        )
+
+    X_train, y_train, _ = load_feature_matrix("train", as_frame=True)
+    params = {"n_jobs": threads} if name in THREADED_MODELS else {}
+    return build_model(name, **params).fit(X_train, y_train)
+
+
+def train_model(name, threads=1, models_path=MODELS_PATH, external_memory=XGBOOST_EXTERNAL_MEMORY):
+    """Fit one model on the training split, save it and evaluate it on the test split
+
+    Runs in its own process: the feature matrices are memory-mapped, so
+    concurrent workers share them through the page cache instead of each
+    holding a copy. The model file is replaced atomically, so a running app
+    never loads a partial file.
+    """
+    from threadpoolctl import threadpool_limits
+
+    import joblib
+
+    from evaluation import evaluate_model, model_threshold
+    from storage import load_feature_matrix
+
+    X_test, y_test, _ = load_feature_matrix("test", as_frame=True)
+
+    rss_before = _peak_rss_bytes()
+    with threadpool_limits(threads):
+        start = time.perf_counter()
+        model = _fit(name, threads, external_memory)
+        fit_seconds = time.perf_counter() - start
+        peak_rss = _peak_rss_bytes()
+        metrics = evaluate_model(model, X_test, y_test, model_threshold(name))
+
+    path = f"{models_path}{name}.pkl"
+    tmp_path = f"{path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+    return {
+        "model": name,
+        "threads": threads if name in THREADED_MODELS else 1,
+        "fit_seconds": fit_seconds,
+        "peak_rss_mb": peak_rss / 1024 / 1024,
+        "fit_rss_mb": max(peak_rss - rss_before, 0) / 1024 / 1024,
+        "metrics": metrics,
+    }
+
+
+def train_all(
+    names=None,
+    n_jobs=TRAINING_N_JOBS,
+    models_path=MODELS_PATH,
+    external_memory=XGBOOST_EXTERNAL_MEMORY,
+    verbose=True,
+):
+    """Train the given models (default: MODELS_CONFIG) concurrently
+
+    Each model is fitted in a fresh process, so its peak memory is measured
+    in isolation. Returns per-model results in the requested order.
+    """
+    names = list(names or MODELS_CONFIG)
+    workers, threads = plan_threads(names, n_jobs)
+    if verbose:
+        print(
+            f"🏋️ Training {len(names)} models in {workers} processes "
+            f"({cpu_budget(n_jobs)} cores, {threads} threads per multi-threaded fit)..."
+        )
+
+    # Longest fits first, so a short one does not delay them
+    order = sorted(names, key=lambda name: name not in THREADED_MODELS)
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        futures = {
+            executor.submit(train_model, name, threads, models_path, external_memory): name
+            for name in order
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["model"]] = result
+            if verbose:
+                print(
+                    f"   ✅ {result['model']}: fit {result['fit_seconds']:.1f}s, "
+                    f"peak RSS {result['peak_rss_mb']:.0f} MB "
+                    f"(+{result['fit_rss_mb']:.0f} MB during fit), "
+                    f"ROC-AUC {result['metrics']['roc_auc']:.3f}"
+                )
+    return [results[name] for name in names]
+
+
+def save_results(results, models_path=MODELS_PATH, reports_path=REPORTS_PATH):
+    """Update the comparison results next to the models and write a JSON training report"""
+    import joblib
+
+    # Models not retrained this time keep their previous results
+    comparison_path = f"{models_path}{COMPARISON_RESULTS_FILENAME}"
+    comparison = joblib.load(comparison_path) if os.path.exists(comparison_path) else {}
+    for name in COMPARISON_NAMES:
+        # Entries keyed by model name by earlier versions of this script
+        comparison.pop(name, None)
+    comparison.update({COMPARISON_NAMES[result["model"]]: result["metrics"] for result in results})
+    joblib.dump(comparison, comparison_path)
+
+    report = [
+        {
+            **{key: value for key, value in result.items() if key != "metrics"},
+            "accuracy": result["metrics"]["accuracy"],
+            "roc_auc": result["metrics"]["roc_auc"],
+        }
+        for result in results
+    ]
+    os.makedirs(reports_path, exist_ok=True)
+    report_path = f"{reports_path}training_report.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report_path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the churn models concurrently")
+    parser.add_argument("--models", nargs="+", default=list(MODELS_CONFIG), choices=list(MODELS_CONFIG))
+    parser.add_argument("--n-jobs", type=int, default=TRAINING_N_JOBS, help="CPU cores to use (-1: all)")
+    parser.add_argument(
+        "--external-memory",
+        action="store_true",
+        default=XGBOOST_EXTERNAL_MEMORY,
+        help="page the XGBoost training matrix to disk instead of holding it in RAM",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        results = train_all(args.models, args.n_jobs, external_memory=args.external_memory)
+    except FileNotFoundError:
+        print("❌ Feature matrices not found. Run the data processing pipeline first.")
+        return False
+
+    report_path = save_results(results)
+    print(f"💾 Models and {COMPARISON_RESULTS_FILENAME} saved to {MODELS_PATH}")
+    print(f"💾 Report written to {report_path}")
+    print(f"⏱️ Total: {time.perf_counter() - start:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,174 @@
+"""
+Compiled inference for XGBoost tree ensembles: flat node arrays, level-synchronous traversal
+"""
+
+import json
+
+import numpy as np
+
+# Rows traversed together; bounds the (rows x trees) node index arrays
+ROW_BLOCK = 4096
+
+
+def _booster_of(model):
+    """Booster, iteration range and input decoder of a saved XGBoost model"""
+    if hasattr(model, "get_booster"):
+        try:
+            iteration_range = (0, model.best_iteration + 1)
+        except AttributeError:
+            iteration_range = (0, 0)
+        return model.get_booster(), iteration_range, None
+    # boosting.BoosterClassifier: categorical codes are recovered from the scaled input
+    return model.booster, (0, 0), model.decoder
+
+
+class CompiledTrees:
+    """The trees of a trained booster as flat numpy arrays
+
+    Every node of every tree gets one slot in the feature, threshold,
+    children (left, right), default_left and value arrays; leaves point to
+    themselves. A batch is scored by moving all (row, tree) cursors one
+    level down per step, so the work is a handful of vectorized gathers
+    per tree level instead of a Python loop per row or node.
+
+    Categorical splits are compiled into numeric ones: each distinct
+    (feature, category set) pair becomes an indicator column, 1 when the
+    code is in the set (goes right, as in XGBoost), 0 for other or invalid
+    codes and NaN when missing, split at 0.5. All nodes then share one
+    branch-free comparison.
+
+    predict_proba() takes the same input as the model it was compiled
+    from, so it can stand in for it anywhere.
+    """
+
+    def __init__(self, booster, iteration_range=(0, 0), decoder=None):
+        self.decoder = decoder
+        self.classes_ = np.array([0, 1])
+
+        model = json.loads(booster.save_raw("json"))["learner"]
+        if model["objective"]["name"] != "binary:logistic":
+            raise ValueError(f"Unsupported objective '{model['objective']['name']}'")
+        base_score = float(str(model["learner_model_param"]["base_score"]).strip("[]"))
+        self.base_margin = float(np.log(base_score / (1 - base_score)))
+        self.n_features = int(model["learner_model_param"]["num_feature"])
+
+        gbtree = model["gradient_booster"]["model"]
+        trees = gbtree["trees"]
+        begin, end = iteration_range
+        if end > 0:
+            indptr = gbtree["iteration_indptr"]
+            trees = trees[indptr[begin]:indptr[end]]
+        self._compile(trees)
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile an XGBClassifier or boosting.BoosterClassifier"""
+        booster, iteration_range, decoder = _booster_of(model)
+        return cls(booster, iteration_range, decoder)
+
+    def _compile(self, trees):
+        features, thresholds, children, default_left, values = [], [], [], [], []
+        indicators = {}  # (feature, categories) -> indicator column
+        roots, depth = [], 0
+        offset = 0
+
+        for tree in trees:
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            right = np.asarray(tree["right_children"], dtype=np.int64)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            feature = np.asarray(tree["split_indices"], dtype=np.int64)
+            nodes = np.arange(len(left))
+            is_leaf = left == -1
+
+            segments = tree["categories_segments"]
+            for node, start, size in zip(tree["categories_nodes"], segments, tree["categories_sizes"]):
+                key = (int(feature[node]), tuple(tree["categories"][start:start + size]))
+                feature[node] = self.n_features + indicators.setdefault(key, len(indicators))
+                conditions[node] = 0.5
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, feature))
+            thresholds.append(np.where(is_leaf, 0, conditions))
+            children.append(
+                np.column_stack([np.where(is_leaf, nodes, left), np.where(is_leaf, nodes, right)])
+                + offset
+            )
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            values.append(np.where(is_leaf, conditions, 0).astype(np.float64))
+
+            # Depth from the parent pointers (parents precede their children)
+            parents = tree["parents"]
+            levels = np.zeros(len(left), dtype=np.int64)
+            for node in nodes[1:]:
+                levels[node] = levels[parents[node]] + 1
+            depth = max(depth, int(levels.max()))
+            offset += len(left)
+
+        self.n_trees = len(trees)
+        self.depth = depth
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.feature = np.concatenate(features).astype(np.int32)
+        self.threshold = np.concatenate(thresholds).astype(np.float32)
+        self.children = np.concatenate(children).astype(np.int32).ravel()
+        self.default_left = np.concatenate(default_left)
+        self.value = np.concatenate(values)
+        # Indicator column k reads feature indicator_feature[k]; row k of the
+        # table maps a code to 1 if it is in the set, and its last entry
+        # (0) serves invalid codes
+        self.indicator_feature = np.array([feature for feature, _ in indicators], dtype=np.intp)
+        width = max((max(categories, default=-1) for _, categories in indicators), default=-1) + 1
+        self.indicator_table = np.zeros((len(indicators), width + 1), dtype=np.float32)
+        for k, (_, categories) in enumerate(indicators):
+            self.indicator_table[k, list(categories)] = 1
+
+    def _columns(self, X):
+        """float32 block with the categorical indicator columns appended"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if not len(self.indicator_feature):
+            return X
+
+        codes = X[:, self.indicator_feature]
+        invalid = self.indicator_table.shape[1] - 1
+        with np.errstate(invalid="ignore"):
+            valid = (codes >= 0) & (codes < invalid) & (codes == np.floor(codes))
+        index = np.where(valid, codes, invalid).astype(np.intp)
+        indicators = self.indicator_table[np.arange(len(self.indicator_feature)), index]
+        indicators[np.isnan(codes)] = np.nan
+        return np.concatenate([X, indicators], axis=1)
+
+    def _leaves(self, X):
+        """Leaf node reached by every (row, tree) pair of a block"""
+        X = self._columns(X)
+        # Offsets of each row in the flattened block, one per (row, tree) cursor
+        row_offset = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        X = X.ravel()
+        has_missing = bool(np.isnan(X).any())
+
+        nodes = np.repeat(self.roots[None, :], len(row_offset), axis=0)
+        for _ in range(self.depth):
+            x = np.take(X, row_offset + np.take(self.feature, nodes))
+            go_right = x >= np.take(self.threshold, nodes)
+            if has_missing:
+                missing = np.isnan(x)
+                go_right[missing] = ~self.default_left[nodes[missing]]
+            nodes = np.take(self.children, 2 * nodes + go_right)
+        return nodes
+
+    def predict_margin(self, X):
+        """Raw scores (log-odds of churn)"""
+        X = self.decoder.decode(np.asarray(X)) if self.decoder else np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        margin = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), ROW_BLOCK):
+            block = X[start:start + ROW_BLOCK]
+            margin[start:start + len(block)] = np.take(self.value, self._leaves(block)).sum(axis=1)
+        return margin + self.base_margin
+
+    def predict_proba(self, X):
+        churn = 1 / (1 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1 - churn, churn])
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X)[:, 1] > threshold).astype(int)
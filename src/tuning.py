@@ -0,0 +1,259 @@
+"""
+Hyperparameter tuning: successive halving over MODELS_CONFIG and PARAM_GRIDS
+
+Usage (from the project root):
+    python src/tuning.py --model xgboost
+    python src/tuning.py --model random_forest --n-jobs 8 --save
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold, train_test_split
+
+# Add config to path
+sys.path.append("config")
+try:
+    from config import (
+        CV_FOLDS,
+        EARLY_STOPPING_ROUNDS,
+        MAX_BOOSTING_ROUNDS,
+        MODELS_CONFIG,
+        MODELS_PATH,
+        PARAM_GRIDS,
+        RANDOM_SEED,
+        REPORTS_PATH,
+        TUNING_HALVING_FACTOR,
+        TUNING_N_JOBS,
+        TUNING_RESOURCES,
+        TUNING_SCORING,
+        VALIDATION_SIZE,
+    )
+except ImportError:
+    # Fallback configuration if config file is not found
+    MODELS_PATH = "../models/"
+    REPORTS_PATH = "../reports/"
+    RANDOM_SEED = 42
+    CV_FOLDS = 5
+    MODELS_CONFIG = {
+        "logistic_regression": {"random_state": RANDOM_SEED, "max_iter": 1000},
+        "random_forest": {"n_estimators": 100, "random_state": RANDOM_SEED, "n_jobs": -1},
+        "xgboost": {
+            "random_state": RANDOM_SEED,
+            "n_estimators": 100,
+            "learning_rate": 0.1,
+            "max_depth": 6,
+        },
+    }
+    PARAM_GRIDS = {
+        "logistic_regression": {"C": [0.01, 0.1, 1.0, 10.0], "class_weight": [None, "balanced"]},
+        "random_forest": {
+            "n_estimators": [100, 200],
+            "max_depth": [None, 8, 16],
+            "min_samples_leaf": [1, 5, 10],
+        },
+        "xgboost": {
+            "n_estimators": [100, 200],
+            "learning_rate": [0.05, 0.1, 0.15],
+            "max_depth": [4, 6, 8],
+            "subsample": [0.8, 0.9],
+            "colsample_bytree": [0.8, 0.9],
+        },
+    }
+    TUNING_RESOURCES = {"random_forest": "n_estimators", "xgboost": "n_estimators"}
+    TUNING_HALVING_FACTOR = 3
+    TUNING_SCORING = "roc_auc"
+    TUNING_N_JOBS = -1
+    MAX_BOOSTING_ROUNDS = 1000
+    EARLY_STOPPING_ROUNDS = 20
+    VALIDATION_SIZE = 0.1
+
+
+def build_model(name, **params):
+    """Estimator for a MODELS_CONFIG entry, with params overriding the config"""
+    params = {**MODELS_CONFIG.get(name, {}), **params}
+    if name == "logistic_regression":
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(**params)
+    if name == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+
+        return RandomForestClassifier(**params)
+    if name == "xgboost":
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(**params)
+    raise ValueError(f"Unknown model '{name}'")
+
+
+# Models whose fit is multi-threaded through an n_jobs parameter
+THREADED_MODELS = ("random_forest", "xgboost")
+
+
+def _single_threaded(name):
+    """Estimator params that keep each fit on one core while folds run in parallel"""
+    return {"n_jobs": 1} if name in THREADED_MODELS else {}
+
+
+def search_space(name, param_grid=None):
+    """Grid to search and the halving resource with its maximum
+
+    When the resource is a hyperparameter (e.g. n_estimators), it is taken
+    out of the grid: candidates are compared on a growing number of trees
+    up to the largest value of the grid (Hyperband-style budget), and every
+    round sees the full training set.
+    """
+    grid = dict(PARAM_GRIDS[name] if param_grid is None else param_grid)
+    resource = TUNING_RESOURCES.get(name, "n_samples")
+    if resource == "n_samples":
+        return grid, resource, "auto"
+    values = grid.pop(resource, None) or [MODELS_CONFIG[name][resource]]
+    return grid, resource, max(values)
+
+
+def tune_model(name, X, y, param_grid=None, cv=CV_FOLDS, n_jobs=TUNING_N_JOBS, verbose=0):
+    """Successive-halving search; returns the fitted (not refitted) search object
+
+    Each round evaluates the surviving candidates on every fold in parallel
+    across n_jobs processes and keeps the best 1/TUNING_HALVING_FACTOR.
+    """
+    grid, resource, max_resources = search_space(name, param_grid)
+    estimator = build_model(name, **(_single_threaded(name) if n_jobs != 1 else {}))
+
+    search = HalvingGridSearchCV(
+        estimator,
+        grid,
+        factor=TUNING_HALVING_FACTOR,
+        resource=resource,
+        max_resources=max_resources,
+        cv=StratifiedKFold(cv, shuffle=True, random_state=RANDOM_SEED),
+        scoring=TUNING_SCORING,
+        refit=False,
+        n_jobs=n_jobs,
+        random_state=RANDOM_SEED,
+        verbose=verbose,
+    )
+    search.fit(X, y)
+    return search
+
+
+def fit_final(name, params, X, y):
+    """Fit the chosen configuration on the training set
+
+    XGBoost is first fitted with up to MAX_BOOSTING_ROUNDS on a stratified
+    split, stopping after EARLY_STOPPING_ROUNDS without validation
+    improvement; the final model is refitted on all rows with the number
+    of rounds found, which replaces params["n_estimators"]. Returns the
+    model and its number of boosting rounds (None for other models).
+    """
+    if name != "xgboost":
+        model = build_model(name, **params)
+        model.fit(X, y)
+        return model, None
+
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=VALIDATION_SIZE, random_state=RANDOM_SEED, stratify=y
+    )
+    probe = build_model(
+        name,
+        **{
+            **params,
+            "n_estimators": MAX_BOOSTING_ROUNDS,
+            "early_stopping_rounds": EARLY_STOPPING_ROUNDS,
+            "eval_metric": "logloss",
+        },
+    )
+    probe.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    rounds = probe.best_iteration + 1
+
+    model = build_model(name, **{**params, "n_estimators": rounds})
+    model.fit(X, y)
+    return model, rounds
+
+
+def tune(name, X, y, param_grid=None, cv=CV_FOLDS, n_jobs=TUNING_N_JOBS, verbose=0):
+    """Search, then fit the best configuration; returns the model and a report"""
+    start = time.perf_counter()
+    search = tune_model(name, X, y, param_grid, cv=cv, n_jobs=n_jobs, verbose=verbose)
+    search_seconds = time.perf_counter() - start
+
+    best_params = dict(search.best_params_)
+    if search.resource == "n_samples":
+        best_params.pop(search.resource, None)
+    else:
+        # Refit with the full budget of the search, not the config's default
+        best_params[search.resource] = int(search.max_resources_)
+
+    model, rounds = fit_final(name, best_params, X, y)
+    report = {
+        "model": name,
+        "best_params": best_params,
+        "cv_score": float(search.best_score_),
+        "scoring": TUNING_SCORING,
+        "cv_folds": cv,
+        "n_candidates": int(search.n_candidates_[0]),
+        "n_iterations": int(search.n_iterations_),
+        "n_fits": int(len(search.cv_results_["params"]) * cv),
+        "boosting_rounds": rounds,
+        "search_seconds": search_seconds,
+        "total_seconds": time.perf_counter() - start,
+    }
+    return model, report
+
+
+def main():
+    import argparse
+
+    import joblib
+
+    from evaluation import classification_metrics
+    from storage import load_feature_matrix
+
+    parser = argparse.ArgumentParser(description="Tune a model with successive halving")
+    parser.add_argument("--model", default="xgboost", choices=list(PARAM_GRIDS))
+    parser.add_argument("--cv", type=int, default=CV_FOLDS)
+    parser.add_argument("--n-jobs", type=int, default=TUNING_N_JOBS)
+    parser.add_argument("--save", action="store_true", help=f"overwrite {MODELS_PATH}<model>.pkl")
+    parser.add_argument("--verbose", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        X_train, y_train, _ = load_feature_matrix("train", as_frame=True)
+        X_test, y_test, _ = load_feature_matrix("test", as_frame=True)
+    except FileNotFoundError:
+        print("❌ Feature matrices not found. Run the data processing pipeline first.")
+        return False
+
+    print(f"🔍 Tuning {args.model} on {len(X_train):,} rows ({args.cv}-fold CV)...")
+    model, report = tune(
+        args.model, X_train, y_train, cv=args.cv, n_jobs=args.n_jobs, verbose=args.verbose
+    )
+    test_metrics = classification_metrics(np.asarray(y_test), model.predict_proba(X_test)[:, 1])
+    report["test_roc_auc"] = test_metrics["roc_auc"]
+
+    print(f"   Candidates: {report['n_candidates']} over {report['n_iterations']} halving rounds")
+    print(f"   Best parameters: {report['best_params']}")
+    if report["boosting_rounds"]:
+        print(f"   Boosting rounds (early stopping): {report['boosting_rounds']}")
+    print(f"   CV {TUNING_SCORING}: {report['cv_score']:.4f}, test ROC-AUC: {report['test_roc_auc']:.4f}")
+    print(f"   ⏱️ {report['search_seconds']:.1f}s search, {report['total_seconds']:.1f}s total")
+
+    os.makedirs(REPORTS_PATH, exist_ok=True)
+    report_path = f"{REPORTS_PATH}tuning_{args.model}.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Report written to {report_path}")
+
+    if args.save:
+        joblib.dump(model, f"{MODELS_PATH}{args.model}.pkl")
+        print(f"💾 Model saved to {MODELS_PATH}{args.model}.pkl")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
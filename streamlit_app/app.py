@@ -4,14 +4,22 @@ Modern Professional Business Intelligence Dashboard
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import joblib
+import os
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append('config')
+sys.path.append('src')
+from config import COMPACT_DTYPES
+from registry import ModelRegistry
+from render_cache import FigureCache
+
+# pandas, matplotlib, sklearn (via the pipeline and pickled encoders) and the
+# evaluation code are imported by the pages that use them, so start-up and
+# pages such as About do not pay for them
+
 # Modern page configuration
 st.set_page_config(
     page_title="Churn Analytics Platform",
@@ -287,35 +295,82 @@ st.markdown("""
 @st.cache_data
 def load_data():
     """Load processed data with error handling"""
+    from storage import compact_dtypes, read_processed
+    
     try:
-        df = pd.read_csv('data/processed/cleaned_data.csv')
+        df = read_processed('cleaned_data')
+        if COMPACT_DTYPES:
+            df, _ = compact_dtypes(df)
         return df
     except FileNotFoundError:
         st.error("🔴 Data not found. Please ensure the data processing pipeline has been completed.")
         return None
 
 @st.cache_resource
-def load_models_and_encoders():
-    """Load models and encoders with comprehensive error handling"""
+def load_aggregate_cube():
+    """Load the dashboard aggregates, building them from the cleaned data if missing"""
+    from aggregates import AggregateCube
+    
     try:
-        data_summary = joblib.load('models/data_summary.pkl')
-        encoders = joblib.load('models/encoders.pkl')
-        scaler = joblib.load('models/scaler.pkl')
-        feature_names = joblib.load('models/feature_names.pkl')
-        
-        models = {}
-        model_files = ['logistic_regression', 'random_forest', 'xgboost']
-        
-        for model_name in model_files:
-            try:
-                models[model_name] = joblib.load(f'models/{model_name}.pkl')
-            except FileNotFoundError:
-                continue
-        
-        return data_summary, encoders, scaler, feature_names, models
+        return AggregateCube.load()
+    except FileNotFoundError:
+        df = load_data()
+        return None if df is None else AggregateCube.from_frame(df)
+
+@st.cache_resource
+def load_figure_cache():
+    """Rendered figures shared by all sessions of this process"""
+    return FigureCache()
+
+def show_figure(key, render):
+    """Display a figure from the render cache, drawing it only on a miss"""
+    st.image(load_figure_cache().get_or_render(key, render), width="stretch")
+
+@st.cache_resource
+def load_data_summary():
+    """Load the dashboard summary with error handling"""
+    import joblib
+    
+    try:
+        return joblib.load('models/data_summary.pkl')
     except FileNotFoundError:
         st.error("🔴 Model files not found. Please complete the model training pipeline.")
-        return None, None, None, None, None
+        return None
+
+def load_preprocessing(registry):
+    """Load the encoders, scaler and feature names used for scoring
+    
+    The registry keeps them in memory and reloads them when the
+    processing pipeline publishes new ones.
+    """
+    try:
+        return registry.preprocessing()
+    except FileNotFoundError:
+        st.error("🔴 Preprocessing artifacts not found. Please run the data processing pipeline.")
+        return None, None, None
+
+@st.cache_resource
+def load_model_registry():
+    """Models are unpickled on first use by a page, not at start-up"""
+    return ModelRegistry(models_path='models/')
+
+def get_row_scorer(registry, model_name):
+    """Single-row scorer for a model, built once and dropped when the model is evicted
+    
+    Its prediction cache goes with it, so publishing a new model or new
+    preprocessing artifacts (which makes the registry reload the model)
+    also invalidates cached scores.
+    """
+    from pipeline import ChurnPipeline, RowScorer
+    from prediction_cache import PredictionCache
+    
+    def build(model):
+        encoders, scaler, feature_names = registry.preprocessing()
+        pipeline = ChurnPipeline(encoders, scaler, feature_names, model, model_name,
+                                 version=registry.version(model_name))
+        return RowScorer(pipeline, cache=PredictionCache())
+    
+    return registry.derived(model_name, 'row_scorer', build)
 
 def main():
     """Main application with modern design"""
@@ -328,11 +383,11 @@ def main():
     </div>
     ''', unsafe_allow_html=True)
     
-    # Load data and models
-    df = load_data()
-    data_summary, encoders, scaler, feature_names, models = load_models_and_encoders()
+    # Models and page data are loaded by the pages that use them
+    data_summary = load_data_summary()
+    registry = load_model_registry()
     
-    if df is None or data_summary is None:
+    if data_summary is None:
         st.stop()
     
     # Modern sidebar navigation
@@ -343,7 +398,7 @@ def main():
         page = st.radio(
             "",
             ["🏠 Executive Dashboard", "🔮 Churn Prediction", "📊 Analytics", "🤖 Model Performance", "ℹ️ About Platform"],
-            index=0
+            key="page"
         )
         
         st.markdown("---")
@@ -356,29 +411,49 @@ def main():
         </div>
         ''', unsafe_allow_html=True)
         
-        if models:
+        model_names = registry.available()
+        if model_names:
             st.markdown(f'''
             <div class="status-card" style="border-left-color: #3b82f6;">
                 <strong>🤖 ML Models Ready</strong><br>
-                <span style="color: #1d4ed8;">{len(models)} algorithms active</span>
+                <span style="color: #1d4ed8;">{len(model_names)} algorithms active</span>
             </div>
             ''', unsafe_allow_html=True)
+        
+        for name in registry.missing():
+            st.warning(f"Model file not found: {registry.path(name)}")
+        
+        with st.expander("🧠 Model Memory"):
+            for row in registry.report():
+                details = row['status']
+                if row['load_seconds'] is not None:
+                    details += f" · loaded in {row['load_seconds'] * 1000:.0f} ms · {row['size_mb']:.1f} MB"
+                st.caption(f"**{row['model'].replace('_', ' ').title()}**: {details}")
+            st.caption(
+                f"{registry.resident_bytes / 1024 / 1024:.1f} MB of "
+                f"{registry.memory_budget / 1024 / 1024:.0f} MB budget in use"
+            )
     
     # Route to pages
     if page == "🏠 Executive Dashboard":
-        show_executive_dashboard(df, data_summary)
+        show_executive_dashboard(data_summary)
     elif page == "🔮 Churn Prediction":
-        show_prediction_interface(encoders, scaler, feature_names, models)
+        show_prediction_interface(registry)
     elif page == "📊 Analytics":
-        show_analytics_dashboard(df)
+        show_analytics_dashboard()
     elif page == "🤖 Model Performance":
-        show_model_comparison(models)
+        show_model_comparison(registry)
     elif page == "ℹ️ About Platform":
         show_about_system()
 
-def show_executive_dashboard(df, data_summary):
+def show_executive_dashboard(data_summary):
     """Modern executive dashboard with enhanced styling"""
     
+    cube = load_aggregate_cube()
+    if cube is None:
+        return
+    data_key = cube.fingerprint()
+    
     st.markdown('<div class="section-header"><h2>📊 Executive Intelligence Center</h2></div>', unsafe_allow_html=True)
     
     # Enhanced KPI cards
@@ -443,69 +518,90 @@ def show_executive_dashboard(df, data_summary):
         st.markdown('<div class="chart-container-modern">', unsafe_allow_html=True)
         st.markdown("#### 🔍 Customer Retention Overview")
         
-        fig, ax = plt.subplots(figsize=(8, 6))
-        churn_counts = df['Churn'].value_counts()
-        colors = ['#3b82f6', '#ef4444']
-        
-        wedges, texts, autotexts = ax.pie(
-            churn_counts.values, 
-            labels=['Retained', 'Churned'],
-            autopct='%1.1f%%',
-            colors=colors,
-            startangle=90,
-            wedgeprops={'edgecolor': 'white', 'linewidth': 3}
-        )
+        def render():
+            import matplotlib.pyplot as plt
+            
+            fig, ax = plt.subplots(figsize=(8, 6))
+            churn_counts = [cube.total_customers - cube.churned_customers, cube.churned_customers]
+            colors = ['#3b82f6', '#ef4444']
         
-        for text in texts:
-            text.set_fontsize(12)
-            text.set_fontweight('600')
-            text.set_color('#1e293b')
+            wedges, texts, autotexts = ax.pie(
+                churn_counts, 
+                labels=['Retained', 'Churned'],
+                autopct='%1.1f%%',
+                colors=colors,
+                startangle=90,
+                wedgeprops={'edgecolor': 'white', 'linewidth': 3}
+            )
         
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-            autotext.set_fontsize(12)
+            for text in texts:
+                text.set_fontsize(12)
+                text.set_fontweight('600')
+                text.set_color('#1e293b')
         
-        ax.set_title('Customer Distribution Analysis', fontsize=14, fontweight='700', color='#1e293b', pad=20)
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
+            for autotext in autotexts:
+                autotext.set_color('white')
+                autotext.set_fontweight('bold')
+                autotext.set_fontsize(12)
+        
+            ax.set_title('Customer Distribution Analysis', fontsize=14, fontweight='700', color='#1e293b', pad=20)
+            fig.patch.set_facecolor('white')
+            ax.set_facecolor('white')
+            return fig
         
-        st.pyplot(fig, use_container_width=True)
-        plt.close()
+        show_figure(('executive', 'retention', data_key), render)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container-modern">', unsafe_allow_html=True)
         st.markdown("#### 💵 Revenue Impact Analysis")
         
-        fig, ax = plt.subplots(figsize=(8, 6))
-        churned = df[df['Churn'] == 'Yes']['MonthlyCharges']
-        retained = df[df['Churn'] == 'No']['MonthlyCharges']
+        def render():
+            import matplotlib.pyplot as plt
+            
+            fig, ax = plt.subplots(figsize=(8, 6))
+            box_stats = [
+                cube.charge_box_stats(churned=False, label='Retained'),
+                cube.charge_box_stats(churned=True, label='Churned'),
+            ]
         
-        bp = ax.boxplot([retained, churned], 
-                       labels=['Retained', 'Churned'],
-                       patch_artist=True,
-                       boxprops={'alpha': 0.8, 'linewidth': 2},
-                       medianprops={'color': 'white', 'linewidth': 3})
+            bp = ax.bxp(box_stats,
+                           patch_artist=True,
+                           boxprops={'alpha': 0.8, 'linewidth': 2},
+                           medianprops={'color': 'white', 'linewidth': 3})
         
-        bp['boxes'][0].set_facecolor('#3b82f6')
-        bp['boxes'][1].set_facecolor('#ef4444')
+            bp['boxes'][0].set_facecolor('#3b82f6')
+            bp['boxes'][1].set_facecolor('#ef4444')
         
-        ax.set_title('Monthly Revenue Distribution', fontsize=14, fontweight='700', color='#1e293b', pad=20)
-        ax.set_ylabel('Monthly Charges ($)', fontsize=12, color='#64748b')
-        ax.grid(True, alpha=0.2, linestyle='--')
-        ax.set_facecolor('#f8fafc')
-        fig.patch.set_facecolor('white')
+            ax.set_title('Monthly Revenue Distribution', fontsize=14, fontweight='700', color='#1e293b', pad=20)
+            ax.set_ylabel('Monthly Charges ($)', fontsize=12, color='#64748b')
+            ax.grid(True, alpha=0.2, linestyle='--')
+            ax.set_facecolor('#f8fafc')
+            fig.patch.set_facecolor('white')
+            return fig
         
-        st.pyplot(fig, use_container_width=True)
-        plt.close()
+        show_figure(('executive', 'revenue', data_key), render)
         st.markdown('</div>', unsafe_allow_html=True)
 
-def show_prediction_interface(encoders, scaler, feature_names, models):
+def show_prediction_interface(registry):
     """Modern prediction interface"""
     
     st.markdown('<div class="section-header"><h2>🔮 Customer Churn Risk Assessment</h2></div>', unsafe_allow_html=True)
     
+    scoring_model = None
+    model_names = registry.available()
+    if model_names:
+        encoders, scaler, feature_names = load_preprocessing(registry)
+        if encoders is None:
+            model_names = []
+    if model_names:
+        scoring_model = st.selectbox(
+            "Scoring Model",
+            model_names,
+            index=model_names.index('xgboost') if 'xgboost' in model_names else 0,
+            format_func=lambda name: name.replace('_', ' ').title()
+        )
+    
     with st.form("customer_prediction"):
         st.markdown("### 📋 Customer Profile Input")
         
@@ -531,9 +627,39 @@ def show_prediction_interface(encoders, scaler, feature_names, models):
         submitted = st.form_submit_button("🔍 Analyze Churn Risk", use_container_width=True)
         
         if submitted:
-            risk_score = calculate_churn_risk(tenure, monthly_charges, contract, 
-                                            payment_method, senior_citizen, internet_service)
+            if scoring_model is None:
+                risk_score = calculate_churn_risk(tenure, monthly_charges, contract, 
+                                                payment_method, senior_citizen, internet_service)
+                display_professional_results(risk_score, monthly_charges, tenure)
+                st.caption("⚠️ No trained models loaded - showing rule-based risk estimate")
+                return
+            
+            profile = {
+                'tenure': tenure,
+                'MonthlyCharges': monthly_charges,
+                'TotalCharges': total_charges,
+                'Contract': contract,
+                'PaymentMethod': payment_method,
+                'SeniorCitizen': senior_citizen,
+                'Partner': partner,
+                'InternetService': internet_service,
+            }
+            if internet_service == "No":
+                for service in ['OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+                                'TechSupport', 'StreamingTV', 'StreamingMovies']:
+                    profile[service] = "No internet service"
+            
+            scorer = get_row_scorer(registry, scoring_model)
+            start = time.perf_counter()
+            risk_score = scorer.score(profile)
+            latency_ms = (time.perf_counter() - start) * 1000
+            
             display_professional_results(risk_score, monthly_charges, tenure)
+            cache = scorer.cache.stats()
+            st.caption(
+                f"⚡ Scored by {scoring_model.replace('_', ' ').title()} in {latency_ms:.3f} ms · "
+                f"prediction cache: {cache['hits']} hits, {cache['misses']} misses"
+            )
 
 def calculate_churn_risk(tenure, monthly_charges, contract, payment_method, senior_citizen, internet_service):
     """Advanced risk calculation algorithm"""
@@ -602,9 +728,14 @@ def display_professional_results(risk_score, monthly_charges, tenure):
         retention_cost = annual_value * 0.15
         st.metric("Est. Retention Cost", f"${retention_cost:,.0f}")
 
-def show_analytics_dashboard(df):
+def show_analytics_dashboard():
     """Modern analytics dashboard"""
     
+    cube = load_aggregate_cube()
+    if cube is None:
+        return
+    data_key = cube.fingerprint()
+    
     st.markdown('<div class="section-header"><h2>📊 Business Analytics Center</h2></div>', unsafe_allow_html=True)
     
     analysis_type = st.selectbox(
@@ -618,91 +749,112 @@ def show_analytics_dashboard(df):
     if analysis_type == "📋 Contract Analysis":
         st.markdown("### Contract Type Impact Analysis")
         
-        contract_churn = pd.crosstab(df['Contract'], df['Churn'], normalize='index')
+        contract_churn = cube.churn_rates('Contract')
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        contract_churn.plot(kind='bar', ax=ax, color=['#3b82f6', '#ef4444'], alpha=0.8)
-        ax.set_title('Churn Rate by Contract Type', fontsize=16, fontweight='700', pad=20)
-        ax.set_xlabel('Contract Type', fontsize=12)
-        ax.set_ylabel('Churn Rate', fontsize=12)
-        ax.legend(['Retained', 'Churned'], fontsize=11)
-        plt.xticks(rotation=0, fontsize=11)
-        plt.grid(axis='y', alpha=0.3)
+        def render():
+            import matplotlib.pyplot as plt
+            
+            fig, ax = plt.subplots(figsize=(12, 6))
+            contract_churn[['No', 'Yes']].plot(kind='bar', ax=ax, color=['#3b82f6', '#ef4444'], alpha=0.8)
+            ax.set_title('Churn Rate by Contract Type', fontsize=16, fontweight='700', pad=20)
+            ax.set_xlabel('Contract Type', fontsize=12)
+            ax.set_ylabel('Churn Rate', fontsize=12)
+            ax.legend(['Retained', 'Churned'], fontsize=11)
+            plt.xticks(rotation=0, fontsize=11)
+            plt.grid(axis='y', alpha=0.3)
         
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('#f8fafc')
+            fig.patch.set_facecolor('white')
+            ax.set_facecolor('#f8fafc')
         
-        plt.tight_layout()
-        st.pyplot(fig, use_container_width=True)
-        plt.close()
+            plt.tight_layout()
+            return fig
+        
+        show_figure(('analytics', 'contract', data_key), render)
         
         st.markdown("#### 💡 Key Insights:")
         for contract in contract_churn.index:
             churn_rate = contract_churn.loc[contract, 'Yes']
-            customer_count = len(df[df['Contract'] == contract])
+            customer_count = contract_churn.loc[contract, 'customers']
             risk_indicator = "🔴" if churn_rate > 0.4 else "🟡" if churn_rate > 0.2 else "🟢"
             st.markdown(f"{risk_indicator} **{contract}**: {churn_rate:.1%} churn rate ({customer_count:,} customers)")
     
     elif analysis_type == "💳 Payment Methods":
         st.markdown("### Payment Method Risk Analysis")
         
-        payment_churn = pd.crosstab(df['PaymentMethod'], df['Churn'], normalize='index')
+        payment_churn = cube.churn_rates('PaymentMethod')
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        payment_churn.plot(kind='bar', ax=ax, color=['#3b82f6', '#ef4444'], alpha=0.8)
-        ax.set_title('Churn Rate by Payment Method', fontsize=16, fontweight='700', pad=20)
-        ax.set_xlabel('Payment Method', fontsize=12)
-        ax.set_ylabel('Churn Rate', fontsize=12)
-        ax.legend(['Retained', 'Churned'], fontsize=11)
-        plt.xticks(rotation=45, fontsize=10)
-        plt.grid(axis='y', alpha=0.3)
+        def render():
+            import matplotlib.pyplot as plt
+            
+            fig, ax = plt.subplots(figsize=(12, 6))
+            payment_churn[['No', 'Yes']].plot(kind='bar', ax=ax, color=['#3b82f6', '#ef4444'], alpha=0.8)
+            ax.set_title('Churn Rate by Payment Method', fontsize=16, fontweight='700', pad=20)
+            ax.set_xlabel('Payment Method', fontsize=12)
+            ax.set_ylabel('Churn Rate', fontsize=12)
+            ax.legend(['Retained', 'Churned'], fontsize=11)
+            plt.xticks(rotation=45, fontsize=10)
+            plt.grid(axis='y', alpha=0.3)
         
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('#f8fafc')
+            fig.patch.set_facecolor('white')
+            ax.set_facecolor('#f8fafc')
         
-        plt.tight_layout()
-        st.pyplot(fig, use_container_width=True)
-        plt.close()
+            plt.tight_layout()
+            return fig
+        
+        show_figure(('analytics', 'payment', data_key), render)
     
     elif analysis_type == "⏰ Customer Lifecycle":
         st.markdown("### Customer Lifecycle Analysis")
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        churned_tenure = df[df['Churn'] == 'Yes']['tenure']
-        retained_tenure = df[df['Churn'] == 'No']['tenure']
+        def render():
+            import matplotlib.pyplot as plt
+            
+            fig, ax = plt.subplots(figsize=(12, 6))
+            edges, retained_tenure, churned_tenure = cube.tenure_histogram()
         
-        ax.hist([retained_tenure, churned_tenure], bins=24, alpha=0.8, 
-                color=['#3b82f6', '#ef4444'], label=['Retained', 'Churned'])
-        ax.set_title('Customer Tenure Distribution', fontsize=16, fontweight='700', pad=20)
-        ax.set_xlabel('Tenure (months)', fontsize=12)
-        ax.set_ylabel('Number of Customers', fontsize=12)
-        ax.legend(fontsize=11)
-        plt.grid(axis='y', alpha=0.3)
+            # Precomputed bin counts drawn as weights on the bin starts
+            ax.hist([edges[:-1], edges[:-1]], bins=edges, weights=[retained_tenure, churned_tenure], alpha=0.8, 
+                    color=['#3b82f6', '#ef4444'], label=['Retained', 'Churned'])
+            ax.set_title('Customer Tenure Distribution', fontsize=16, fontweight='700', pad=20)
+            ax.set_xlabel('Tenure (months)', fontsize=12)
+            ax.set_ylabel('Number of Customers', fontsize=12)
+            ax.legend(fontsize=11)
+            plt.grid(axis='y', alpha=0.3)
         
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('#f8fafc')
+            fig.patch.set_facecolor('white')
+            ax.set_facecolor('#f8fafc')
         
-        plt.tight_layout()
-        st.pyplot(fig, use_container_width=True)
-        plt.close()
+            plt.tight_layout()
+            return fig
+        
+        show_figure(('analytics', 'lifecycle', data_key), render)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def show_model_comparison(models):
+def show_model_comparison(registry):
     """Enhanced model comparison page"""
+    from evaluation import fingerprint_files, model_threshold
     
     st.markdown('<div class="section-header"><h2>🤖 Model Performance Center</h2></div>', unsafe_allow_html=True)
     
     try:
-        test_data = pd.read_csv('data/processed/test_data.csv')
-        X_test = test_data.drop('Churn', axis=1)
-        y_test = test_data['Churn']
+        test_paths = test_set_paths()
+        if not test_paths:
+            raise FileNotFoundError
         
-        if models is None or len(models) == 0:
+        model_names = registry.available()
+        if not model_names:
             st.warning("No trained models found. Please train models first.")
             return
         
-        model_results = evaluate_all_models(models, X_test, y_test)
+        # Results are re-computed only when a model file or the test set changes,
+        # and only the models with stale results are loaded
+        test_hash = fingerprint_files(test_paths)
+        model_hashes = {name: fingerprint_files([registry.path(name)]) for name in model_names}
+        model_results = load_evaluation_cache().results(
+            dict.fromkeys(model_names), model_hashes, test_hash,
+            lambda missing: evaluate_all_models(list(missing), registry, *load_test_set())
+        )
         
         if not model_results:
             st.error("Could not evaluate models. Please check model files.")
@@ -710,16 +862,22 @@ def show_model_comparison(models):
         
         display_model_performance_table(model_results)
         
+        # Charts change only with the models, the test set or the thresholds
+        results_key = (
+            test_hash,
+            tuple((name, model_hashes[name], model_threshold(name)) for name in model_results),
+        )
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown('<div class="chart-container-modern">', unsafe_allow_html=True)
-            display_performance_chart(model_results)
+            display_performance_chart(model_results, results_key)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="chart-container-modern">', unsafe_allow_html=True)
-            display_roc_curves(model_results, y_test)
+            display_roc_curves(model_results, results_key)
             st.markdown('</div>', unsafe_allow_html=True)
         
         show_best_model_summary(model_results)
@@ -727,26 +885,46 @@ def show_model_comparison(models):
     except FileNotFoundError:
         st.error("Test data not found. Please run the data processing pipeline first.")
 
-def evaluate_all_models(models, X_test, y_test):
+@st.cache_resource
+def load_evaluation_cache():
+    """Persisted evaluation results, loaded once per process"""
+    from evaluation import EvaluationCache
+    
+    return EvaluationCache()
+
+def test_set_paths():
+    """Files the test set is loaded from, used to fingerprint it"""
+    from storage import feature_matrix_paths, resolve_processed
+    
+    features_path, labels_path, header_path = feature_matrix_paths('test')
+    if os.path.exists(features_path):
+        return [features_path, labels_path, header_path]
+    path, _ = resolve_processed('test_data')
+    return [path] if path else []
+
+def load_test_set():
+    """Load the test features and labels"""
+    from storage import load_feature_matrix, read_processed
+    
+    try:
+        # Memory-mapped float32 matrix, shared between workers via the page cache
+        X_test, y_test, _ = load_feature_matrix('test', as_frame=True)
+    except FileNotFoundError:
+        test_data = read_processed('test_data')
+        X_test = test_data.drop('Churn', axis=1)
+        y_test = test_data['Churn']
+    return X_test, y_test
+
+def evaluate_all_models(model_names, registry, X_test, y_test):
     """Evaluate all models and return performance metrics"""
-    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+    from evaluation import evaluate_model, model_threshold
     
     results = {}
     
-    for name, model in models.items():
+    for name in model_names:
         try:
-            y_pred = model.predict(X_test)
-            y_pred_proba = model.predict_proba(X_test)[:, 1]
-            
-            results[name] = {
-                'accuracy': accuracy_score(y_test, y_pred),
-                'precision': precision_score(y_test, y_pred, zero_division=0),
-                'recall': recall_score(y_test, y_pred, zero_division=0),
-                'f1_score': f1_score(y_test, y_pred, zero_division=0),
-                'roc_auc': roc_auc_score(y_test, y_pred_proba),
-                'predictions': y_pred,
-                'probabilities': y_pred_proba
-            }
+            # One model at a time, so the registry can evict between them
+            results[name] = evaluate_model(registry.get(name), X_test, y_test, model_threshold(name))
         except Exception as e:
             st.warning(f"Error evaluating {name}: {str(e)}")
             continue
@@ -755,6 +933,7 @@ def evaluate_all_models(models, X_test, y_test):
 
 def display_model_performance_table(model_results):
     """Display professional performance metrics table"""
+    import pandas as pd
     
     st.subheader("📊 Performance Metrics")
     
@@ -766,7 +945,8 @@ def display_model_performance_table(model_results):
             'Precision': f"{metrics['precision']:.3f}",
             'Recall': f"{metrics['recall']:.3f}",
             'F1-Score': f"{metrics['f1_score']:.3f}",
-            'ROC-AUC': f"{metrics['roc_auc']:.3f}"
+            'ROC-AUC': f"{metrics['roc_auc']:.3f}",
+            'Threshold': f"{metrics.get('threshold', 0.5):.2f}"
         })
     
     comparison_df = pd.DataFrame(comparison_data)
@@ -777,7 +957,7 @@ def display_model_performance_table(model_results):
     
     st.success(f"🏆 Best Performing Model: **{best_model.replace('_', ' ').title()}** (ROC-AUC: {best_auc:.3f})")
 
-def display_performance_chart(model_results):
+def display_performance_chart(model_results, results_key):
     """Display enhanced performance comparison chart"""
     
     st.subheader("📈 Performance Comparison")
@@ -786,67 +966,75 @@ def display_performance_chart(model_results):
     accuracies = [model_results[name]['accuracy'] for name in model_results.keys()]
     roc_aucs = [model_results[name]['roc_auc'] for name in model_results.keys()]
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    def render():
+        import matplotlib.pyplot as plt
+        import numpy as np
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
     
-    x = np.arange(len(models))
-    width = 0.35
+        x = np.arange(len(models))
+        width = 0.35
     
-    bars1 = ax.bar(x - width/2, accuracies, width, label='Accuracy', alpha=0.8, color='#3b82f6')
-    bars2 = ax.bar(x + width/2, roc_aucs, width, label='ROC-AUC', alpha=0.8, color='#ef4444')
+        bars1 = ax.bar(x - width/2, accuracies, width, label='Accuracy', alpha=0.8, color='#3b82f6')
+        bars2 = ax.bar(x + width/2, roc_aucs, width, label='ROC-AUC', alpha=0.8, color='#ef4444')
     
-    ax.set_xlabel('Models', fontweight='600', fontsize=12)
-    ax.set_ylabel('Score', fontweight='600', fontsize=12)
-    ax.set_title('Model Performance Comparison', fontweight='700', fontsize=14)
-    ax.set_xticks(x)
-    ax.set_xticklabels(models, rotation=0, fontsize=11)
-    ax.legend(fontsize=11)
-    ax.grid(axis='y', alpha=0.3)
-    ax.set_ylim(0, 1)
+        ax.set_xlabel('Models', fontweight='600', fontsize=12)
+        ax.set_ylabel('Score', fontweight='600', fontsize=12)
+        ax.set_title('Model Performance Comparison', fontweight='700', fontsize=14)
+        ax.set_xticks(x)
+        ax.set_xticklabels(models, rotation=0, fontsize=11)
+        ax.legend(fontsize=11)
+        ax.grid(axis='y', alpha=0.3)
+        ax.set_ylim(0, 1)
     
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                   f'{height:.3f}', ha='center', va='bottom', fontsize=10, fontweight='600')
+        for bars in [bars1, bars2]:
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height + 0.01,
+                       f'{height:.3f}', ha='center', va='bottom', fontsize=10, fontweight='600')
     
-    fig.patch.set_facecolor('white')
-    ax.set_facecolor('#f8fafc')
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('#f8fafc')
+    
+        plt.tight_layout()
+        return fig
     
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
-    plt.close()
+    show_figure(('model_performance', 'comparison', results_key), render)
 
-def display_roc_curves(model_results, y_test):
+def display_roc_curves(model_results, results_key):
     """Display enhanced ROC curves"""
-    from sklearn.metrics import roc_curve
     
     st.subheader("📊 ROC Analysis")
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    colors = ['#3b82f6', '#ef4444', '#10b981', '#f59e0b', '#8b5cf6']
+    def render():
+        import matplotlib.pyplot as plt
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
+        colors = ['#3b82f6', '#ef4444', '#10b981', '#f59e0b', '#8b5cf6']
     
-    for i, (name, metrics) in enumerate(model_results.items()):
-        fpr, tpr, _ = roc_curve(y_test, metrics['probabilities'])
-        auc_score = metrics['roc_auc']
-        color = colors[i % len(colors)]
+        for i, (name, metrics) in enumerate(model_results.items()):
+            fpr, tpr = metrics['fpr'], metrics['tpr']
+            auc_score = metrics['roc_auc']
+            color = colors[i % len(colors)]
         
-        ax.plot(fpr, tpr, color=color, linewidth=3, 
-               label=f'{name.replace("_", " ").title()} (AUC = {auc_score:.3f})')
+            ax.plot(fpr, tpr, color=color, linewidth=3, 
+                   label=f'{name.replace("_", " ").title()} (AUC = {auc_score:.3f})')
     
-    ax.plot([0, 1], [0, 1], 'k--', alpha=0.6, linewidth=2, label='Random Classifier')
+        ax.plot([0, 1], [0, 1], 'k--', alpha=0.6, linewidth=2, label='Random Classifier')
     
-    ax.set_xlabel('False Positive Rate', fontweight='600', fontsize=12)
-    ax.set_ylabel('True Positive Rate', fontweight='600', fontsize=12)
-    ax.set_title('ROC Curves Comparison', fontweight='700', fontsize=14)
-    ax.legend(loc='lower right', fontsize=10)
-    ax.grid(alpha=0.3)
+        ax.set_xlabel('False Positive Rate', fontweight='600', fontsize=12)
+        ax.set_ylabel('True Positive Rate', fontweight='600', fontsize=12)
+        ax.set_title('ROC Curves Comparison', fontweight='700', fontsize=14)
+        ax.legend(loc='lower right', fontsize=10)
+        ax.grid(alpha=0.3)
     
-    fig.patch.set_facecolor('white')
-    ax.set_facecolor('#f8fafc')
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('#f8fafc')
+    
+        plt.tight_layout()
+        return fig
     
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
-    plt.close()
+    show_figure(('model_performance', 'roc', results_key), render)
 
 def show_best_model_summary(model_results):
     """Show enhanced best model summary"""